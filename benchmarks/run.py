@@ -0,0 +1,375 @@
+"""
+Benchmark-Suite für den Render-Pfad.
+
+    python -m benchmarks.run                    # messen, Ergebnis nach bench_results.json
+    python -m benchmarks.run --save-baseline    # Ergebnis als neue Baseline ablegen
+    python -m benchmarks.run --threshold 0.3    # Abweichung > 30 % gegenüber Baseline = Fehler
+
+Gemessen werden die Stufen von create_socialmedia_carousel (über generator.instrument)
+für die mitgelieferten Module und einen synthetischen Katalog sowie fit_text, wrap_text
+und create_grid_cutout_mask einzeln. Alle Caches sind aus bzw. werden pro Durchlauf geleert,
+damit jede Wiederholung die volle Arbeit misst.
+
+Die startup:*-Werte messen Kaltstarts in jeweils frischen Interpreter-Prozessen
+(Import des Pakets, main.py --help, ein Modul mit und ohne Render-Cache-Treffer),
+also das, was ein einzelner CLI-Aufruf aus dem CMS kostet.
+"""
+import argparse
+import contextlib
+import copy
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, base_dir)
+
+from PIL import Image, ImageDraw
+
+from generator import background_cache, fingerprint, fingerprint_cache, fonts, generator, hyphenation, instrument, photos, scene
+
+BASELINE_PATH = os.path.join(base_dir, "benchmarks", "baseline.json")
+# Alle Pfade absolut: die Suite läuft unabhängig vom aktuellen Arbeitsverzeichnis
+BASE_CONFIG_PATH = os.path.join(base_dir, "config", "config.json")
+SHIPPED_MODULES = [
+    os.path.join(base_dir, "config", "programmieren1.json"),
+    os.path.join(base_dir, "config", "grundlagen_informatik.json"),
+]
+FONT_REGULAR = os.path.join(base_dir, "assets", "fonts", "Roboto-Regular.ttf")
+FONT_BOLD = os.path.join(base_dir, "assets", "fonts", "Roboto-Bold.ttf")
+FINGERPRINT_IMAGE = os.path.join(base_dir, "assets", "backgrounds_fingerprint", "background_default.jpg")
+
+# Läuft in einem frischen Interpreter: Zeit vom Prozessstart bis nach dem Rendern (letzte Zeile)
+STARTUP_RENDER = """
+import time
+start = time.perf_counter()
+import json, sys
+from generator import generator
+generator.create_socialmedia_carousel(json.loads(sys.argv[1]))
+print(time.perf_counter() - start)
+"""
+
+STARTUP_IMPORT = """
+import time
+start = time.perf_counter()
+from generator import generator
+print(time.perf_counter() - start)
+"""
+
+# Kürzere Messungen schwanken zu stark, um sie prozentual zu vergleichen
+NOISE_FLOOR = 0.005
+
+WORDS = (
+    "Grundlagen Programmierung Datenstrukturen Algorithmen Objektorientierung "
+    "Softwarearchitektur Wirtschaftsinformatik Datenbanksysteme Betriebssysteme "
+    "Rechnernetze Modellierung Projektmanagement Informationssicherheit Statistik "
+    "und mit der für Einführung in Praxis Theorie Methoden Anwendungen"
+).split()
+
+
+def load_json_file(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def benchmark_config():
+    """Basis-Konfiguration ohne Render-, Layout-, Grundebenen-, Platten- und Fingerprint-Cache."""
+    config = load_json_file(BASE_CONFIG_PATH) if os.path.exists(BASE_CONFIG_PATH) else {}
+    config = copy.deepcopy(config)
+    config["cache"] = {
+        **config.get("cache", {}),
+        "render": False,
+        "fingerprint": False,
+        "fingerprint_disk": False,
+        "photos": False,
+        "photos_disk": False,
+        "scenes": False,
+        "backgrounds": False,
+    }
+    return config
+
+
+def clear_caches():
+    """Leert alle prozessweiten Caches, damit Wiederholungen vergleichbar sind."""
+    fonts.clear_font_cache()
+    fingerprint_cache.memory_cache.clear()
+    photos.memory_cache.clear()
+    scene.memory_cache.clear()
+    background_cache.memory_cache.clear()
+    hyphenation.clear_hyphenation_cache()
+
+
+def synthetic_text(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def synthetic_catalog(count, seed=1234):
+    """
+    Erzeugt count Module auf Basis von programmieren1.json mit langen, zufälligen Texten
+    und aktiviertem Fingerprint (fester Seed, damit jeder Lauf dieselbe Arbeit macht).
+    """
+    template = load_json_file(SHIPPED_MODULES[0])["modules"][0]
+    rng = random.Random(seed)
+    modules = []
+    for i in range(count):
+        module = copy.deepcopy(template)
+        module["id"] = f"SYN{i + 1}"
+        module["title"] = synthetic_text(rng, rng.randint(2, 6))
+        module["slice1_info"] = synthetic_text(rng, rng.randint(6, 14))
+        module["slice3_info"] = synthetic_text(rng, rng.randint(10, 30))
+        module["lecturer"]["name"] = "Prof. Dr. " + synthetic_text(rng, 2)
+        fp = module["fingerprint"]
+        fp["enabled"] = True
+        fp["input_image"] = FINGERPRINT_IMAGE
+        fp["random_seed"] = seed + i
+        fp["background_mode"] = "centered" if i % 2 == 0 else "inset"
+        modules.append(module)
+    return modules
+
+
+def time_call(func, repeat):
+    """Führt func repeat-mal aus und gibt die Einzelzeiten in Sekunden zurück."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def summarize(samples):
+    return {
+        "median": statistics.median(samples),
+        "min": min(samples),
+        "max": max(samples),
+        "runs": len(samples),
+    }
+
+
+def bench_render(name, modules, base_config, repeat):
+    """
+    Rendert die Module repeat-mal und sammelt die Stufenzeiten.
+    Stufenwerte sind Summen über alle Module eines Durchlaufs.
+    """
+    out_root = tempfile.mkdtemp(prefix="bench_")
+    totals = []
+    stages = {}
+    try:
+        for _ in range(repeat):
+            clear_caches()
+            with instrument.recording() as recorder, contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                for i, module in enumerate(modules):
+                    config = {**base_config, "modules": [module], "output_path": os.path.join(out_root, str(i))}
+                    generator.create_socialmedia_carousel(config)
+                totals.append(time.perf_counter() - start)
+            for stage_name, seconds in recorder.totals().items():
+                stages.setdefault(stage_name, []).append(seconds)
+    finally:
+        shutil.rmtree(out_root, ignore_errors=True)
+
+    results = {f"render:{name}:total": summarize(totals)}
+    for stage_name, samples in sorted(stages.items()):
+        results[f"render:{name}:{stage_name}"] = summarize(samples)
+    return results
+
+
+def bench_text(repeat):
+    """
+    fit_text und wrap_text auf langen synthetischen Texten. wrap_text:hyphenated bricht
+    schmal um, sodass die Komposita (auch mehrfach) getrennt werden; _warm behält dabei
+    Fonts und Trennstellen wie bei vielen Modulen in einem Prozess.
+    """
+    rng = random.Random(99)
+    texts = [synthetic_text(rng, n) for n in (5, 20, 60, 120)]
+    draw = ImageDraw.Draw(Image.new("RGB", (1, 1)))
+    hyphenator = hyphenation.get_hyphenator("de_DE")
+
+    def run_fit():
+        fonts.clear_font_cache()
+        for text in texts:
+            generator.fit_text(draw, text, FONT_REGULAR, 130, 900, 900, min_size=10, step=1, spacing=10)
+
+    def run_wrap():
+        fonts.clear_font_cache()
+        for size in (48, 70, 130):
+            font = fonts.get_font(FONT_BOLD, size)
+            for text in texts:
+                generator.wrap_text(draw, text, font, 900, hyphenator=hyphenator)
+
+    def run_hyphenated():
+        for size in (48, 70, 130):
+            font = fonts.get_font(FONT_BOLD, size)
+            for max_width in (240, 360):
+                for text in texts:
+                    generator.wrap_text(draw, text, font, max_width, hyphenator=hyphenator)
+
+    def run_hyphenated_cold():
+        fonts.clear_font_cache()
+        hyphenation.clear_hyphenation_cache()
+        run_hyphenated()
+
+    results = {
+        "fit_text": summarize(time_call(run_fit, repeat)),
+        "wrap_text": summarize(time_call(run_wrap, repeat)),
+        "wrap_text:hyphenated": summarize(time_call(run_hyphenated_cold, repeat)),
+    }
+    run_hyphenated()
+    results["wrap_text:hyphenated_warm"] = summarize(time_call(run_hyphenated, repeat))
+    return results
+
+
+def bench_mask(repeat):
+    """
+    Raster-Maske in Originalgröße des Fingerprint-Bilds (FINGERPRINT_IMAGE, 5389x3593)
+    mit den Masken-Parametern von programmieren1.json, mit beiden Engines.
+    """
+    with Image.open(FINGERPRINT_IMAGE) as image:
+        size = image.size
+    fp = load_json_file(SHIPPED_MODULES[0])["modules"][0]["fingerprint"]
+    base = fp["base_size"]
+    params = dict(zone_thickness=base, rect_w=base, rect_h=base, omit_chance=fp["grid"]["omit_chance"],
+                  zone_count=fp["zone_count"], enabled_sides=fp["enabled_sides"])
+
+    def run_pillow():
+        random.seed(7)
+        fingerprint.create_grid_cutout_mask(*size, **params)
+
+    results = {"grid_mask:pillow": summarize(time_call(run_pillow, repeat))}
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return results
+
+    def run_numpy():
+        fingerprint.create_grid_cutout_mask_np(*size, **params, seed=7)
+
+    results["grid_mask:numpy"] = summarize(time_call(run_numpy, repeat))
+    return results
+
+
+def run_python(args):
+    """Startet einen neuen Interpreter im Projektordner und gibt (Wandzeit, letzte Ausgabezeile) zurück."""
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, *args], cwd=base_dir, capture_output=True, text=True, check=True)
+    elapsed = time.perf_counter() - start
+    lines = proc.stdout.strip().splitlines()
+    return elapsed, lines[-1] if lines else ""
+
+
+def bench_startup(base_config, repeat):
+    """Kaltstart in frischen Prozessen: Paket-Import, CLI-Hilfe, Modul ohne und mit Render-Cache-Treffer."""
+    repeat = max(repeat, 5)
+    module = load_json_file(SHIPPED_MODULES[0])["modules"][0]
+    out_root = tempfile.mkdtemp(prefix="bench_startup_")
+    cold = {**base_config, "modules": [module], "output_path": os.path.join(out_root, "cold")}
+    cached = {**cold, "cache": {**cold["cache"], "render": True}, "output_path": os.path.join(out_root, "cached")}
+
+    def in_process(args):
+        return [float(run_python(args)[1]) for _ in range(repeat)]
+
+    try:
+        results = {
+            "startup:interpreter": summarize([run_python(["-c", "pass"])[0] for _ in range(repeat)]),
+            "startup:import": summarize(in_process(["-c", STARTUP_IMPORT])),
+            "startup:cli_help": summarize([run_python(["main.py", "--help"])[0] for _ in range(repeat)]),
+            "startup:render_cold": summarize(in_process(["-c", STARTUP_RENDER, json.dumps(cold)])),
+        }
+        # Erster Lauf legt den Render-Cache-Stempel an, die gemessenen Läufe treffen ihn
+        run_python(["-c", STARTUP_RENDER, json.dumps(cached)])
+        results["startup:render_cached"] = summarize(in_process(["-c", STARTUP_RENDER, json.dumps(cached)]))
+    finally:
+        shutil.rmtree(out_root, ignore_errors=True)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Gibt die Benchmarks zurück, deren Median mehr als threshold über der Baseline liegt."""
+    regressions = []
+    for name, entry in results.items():
+        reference = baseline.get(name)
+        if not reference:
+            continue
+        old, new = reference["median"], entry["median"]
+        if max(old, new) < NOISE_FLOOR:
+            continue
+        if new > old * (1 + threshold):
+            regressions.append((name, old, new))
+    return regressions
+
+
+def print_table(results, baseline):
+    width = max(len(name) for name in results)
+    print(f"{'Benchmark':<{width}}  {'Median':>9}  {'Baseline':>9}  {'Änderung':>8}")
+    for name, entry in results.items():
+        new = entry["median"]
+        reference = baseline.get(name)
+        if reference:
+            old = reference["median"]
+            change = f"{(new - old) / old * 100:+.1f}%" if old else "-"
+            print(f"{name:<{width}}  {new * 1000:>7.1f}ms  {old * 1000:>7.1f}ms  {change:>8}")
+        else:
+            print(f"{name:<{width}}  {new * 1000:>7.1f}ms  {'-':>9}  {'-':>8}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks für den Carousel-Generator.")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="Wiederholungen je Benchmark (Median zählt)")
+    parser.add_argument("--catalog-size", type=int, default=6, help="Anzahl Module im synthetischen Katalog")
+    parser.add_argument("-o", "--output", default="bench_results.json", help="Zieldatei für die Ergebnisse")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline zum Vergleich")
+    parser.add_argument("--save-baseline", action="store_true", help="Ergebnisse als neue Baseline speichern")
+    parser.add_argument("-t", "--threshold", type=float, default=0.25,
+                        help="erlaubte relative Verlangsamung gegenüber der Baseline (0.25 = 25 %%)")
+    args = parser.parse_args(argv)
+
+    base_config = benchmark_config()
+    shipped = [load_json_file(path)["modules"][0] for path in SHIPPED_MODULES]
+
+    results = {}
+    results.update(bench_render("shipped", shipped, base_config, args.repeat))
+    results.update(bench_render("synthetic", synthetic_catalog(args.catalog_size), base_config, args.repeat))
+    results.update(bench_text(args.repeat))
+    results.update(bench_mask(args.repeat))
+    results.update(bench_startup(base_config, args.repeat))
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "catalog_size": args.catalog_size,
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"[INFO] Ergebnisse gespeichert: {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"[INFO] Baseline gespeichert: {args.baseline}")
+        print_table(results, {})
+        return 0
+
+    baseline = load_json_file(args.baseline)["results"] if os.path.exists(args.baseline) else {}
+    print_table(results, baseline)
+    if not baseline:
+        print("[WARN] Keine Baseline vorhanden – Vergleich übersprungen (--save-baseline).")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    for name, old, new in regressions:
+        print(f"[FEHLER] {name}: {old * 1000:.1f}ms → {new * 1000:.1f}ms (> {args.threshold:.0%} langsamer)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
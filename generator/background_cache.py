@@ -0,0 +1,47 @@
+from .cache import ImageLRUCache, cache_settings, config_digest, file_digest
+from .instrument import stage
+
+# Prozessweiter Speicher fertiger Grundebenen (Größe über cache.background_memory_mb)
+memory_cache = ImageLRUCache(128 * 1024 * 1024)
+
+
+def background_key(size, background, fingerprint_config, scale):
+    """
+    Schlüssel der Grundebene: Hintergrundfarbe, Fingerprint-Config (das Eingabebild
+    über seinen Content-Hash), Canvas-Größe und Skalierung. Mit Fingerprint ohne
+    random_seed ist das Ergebnis zufällig; dann gibt es keinen Schlüssel (None).
+    """
+    fingerprint = None
+    if fingerprint_config:
+        if fingerprint_config.get("random_seed") is None:
+            return None
+        fingerprint = {**fingerprint_config, "input_image": file_digest(fingerprint_config.get("input_image", ""))}
+    return config_digest({
+        "size": list(size),
+        "scale": scale,
+        "background": list(background),
+        "fingerprint": fingerprint,
+    })
+
+
+def load_background_layer(config, size, background, fingerprint_config, scale, build):
+    """
+    Liefert eine eigene Kopie der Grundebene (Hintergrundfarbe plus Fingerprint),
+    auf die das Modul nur noch Dozentenbild und Textboxen zeichnet.
+    build() erzeugt die Ebene; die fertige Ebene wird
+    im Speicher-LRU geteilt, Module mit gleichem Look kopieren sie nur noch.
+    """
+    settings = cache_settings(config)
+    key = None
+    if settings.get("backgrounds", True):
+        key = background_key(size, background, fingerprint_config, scale)
+    if key is None:
+        return build()
+
+    memory_cache.max_bytes = int(settings.get("background_memory_mb", 128) * 1024 * 1024)
+    layer = memory_cache.get(key)
+    if layer is None:
+        layer = build()
+        memory_cache.put(key, layer)
+    with stage("background"):
+        return layer.copy()
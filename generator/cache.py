@@ -0,0 +1,126 @@
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+
+# Projektwurzel (relative Cache-Verzeichnisse werden hierzu aufgelöst)
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Prozessweiter Speicher bereits berechneter Datei-Hashes
+_file_digests = {}
+
+
+def file_digest(path):
+    """
+    Liefert den SHA-256-Hash eines Dateiinhalts.
+    Der Hash wird pro (Pfad, mtime, Größe) nur einmal berechnet.
+    Fehlende Dateien ergeben den Marker "missing", damit sie trotzdem in einen Schlüssel eingehen.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return "missing"
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    digest = _file_digests.get(key)
+    if digest is None:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        digest = h.hexdigest()
+        _file_digests[key] = digest
+    return digest
+
+
+def config_digest(obj):
+    """Stabiler SHA-256-Hash eines JSON-fähigen Objekts (Schlüsselreihenfolge egal)."""
+    data = json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def cache_settings(config):
+    """Liest den Abschnitt "cache" der Hauptkonfiguration (fehlend = Standardwerte)."""
+    cfg = config.get("cache")
+    return cfg if isinstance(cfg, dict) else {}
+
+
+
+def cache_dir(config, *parts):
+    """Pfad eines Unterordners im Cache-Verzeichnis (Standard: <Projekt>/.cache)."""
+    root = cache_settings(config).get("dir", ".cache")
+    if not os.path.isabs(root):
+        root = os.path.join(base_dir, root)
+    return os.path.join(root, *parts)
+
+
+def image_nbytes(image):
+    """Ungefährer Speicherbedarf eines Pillow-Bildes in Bytes."""
+    return image.width * image.height * len(image.getbands())
+
+
+class ImageLRUCache:
+    """
+    LRU-Cache für Pillow-Bilder mit Obergrenze in Bytes.
+    Zurückgegebene Bilder werden geteilt und dürfen vom Aufrufer nicht verändert werden.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            image = self._items.get(key)
+            if image is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return image
+
+    def put(self, key, image):
+        size = image_nbytes(image)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.current_bytes -= image_nbytes(old)
+            self._items[key] = image
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes and self._items:
+                _, evicted = self._items.popitem(last=False)
+                self.current_bytes -= image_nbytes(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._items), "bytes": self.current_bytes}
+
+
+def load_cached_image(path):
+    """Lädt ein Bild aus dem Disk-Cache vollständig in den Speicher (None, falls nicht vorhanden/defekt)."""
+    from PIL import Image
+
+    try:
+        with Image.open(path) as image:
+            image.load()
+            return image.copy()
+    except (OSError, ValueError):
+        return None
+
+
+def store_cached_image(path, image):
+    """Speichert ein Bild atomar im Disk-Cache (schnelle PNG-Kompression)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    image.save(tmp_path, format="PNG", compress_level=1)
+    os.replace(tmp_path, path)
@@ -0,0 +1,158 @@
+import json
+import queue
+import threading
+
+# Lesegröße beim inkrementellen Parsen großer JSON-Dateien
+CHUNK_SIZE = 64 * 1024
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\r\n"
+
+
+def iter_catalog(path):
+    """
+    Liefert die Module eines Katalogs einzeln, ohne die Datei komplett zu laden.
+    .jsonl/.ndjson: ein Modul (oder {"modules": [...]}) pro Zeile,
+    sonst: JSON-Array von Modulen oder Objekt mit "modules"-Array.
+    """
+    if path.endswith((".jsonl", ".ndjson")):
+        return iter_json_lines(path)
+    return iter_json_array(path)
+
+
+def iter_json_lines(path):
+    with open(path, encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                obj = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"{path}, Zeile {lineno}: ungültiges JSON ({e})") from None
+            yield from _modules_of(obj)
+
+
+def _modules_of(obj):
+    if isinstance(obj, dict) and isinstance(obj.get("modules"), list):
+        return obj["modules"]
+    return [obj]
+
+
+class _Reader:
+    """Puffer über einer Textdatei, der bei Bedarf weitere Blöcke nachliest."""
+
+    def __init__(self, f):
+        self.f = f
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        if self.eof:
+            return False
+        chunk = self.f.read(CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        # Bereits verarbeiteten Teil verwerfen, damit der Puffer klein bleibt
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Nächstes Zeichen nach Leerraum (ohne es zu verbrauchen), "" am Dateiende."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"'{char}' erwartet an Position {self.pos}")
+        self.pos += 1
+
+    def value(self):
+        """Dekodiert den nächsten vollständigen JSON-Wert, liest dafür so viel wie nötig nach."""
+        self.peek()
+        while True:
+            try:
+                obj, end = _decoder.raw_decode(self.buf, self.pos)
+            except ValueError:
+                if self.fill():
+                    continue
+                raise
+            # Eine Zahl am Pufferende könnte noch weitergehen
+            if end == len(self.buf) and not self.eof and self.fill():
+                continue
+            self.pos = end
+            return obj
+
+
+def iter_json_array(path):
+    with open(path, encoding="utf-8") as f:
+        reader = _Reader(f)
+        first = reader.peek()
+        if first == "{":
+            # Objekt: bis zum Schlüssel "modules" vorspulen, andere Werte überspringen
+            reader.expect("{")
+            while True:
+                key = reader.value()
+                reader.expect(":")
+                if key == "modules" and reader.peek() == "[":
+                    break
+                reader.value()
+                if reader.peek() == ",":
+                    reader.expect(",")
+                    continue
+                reader.expect("}")
+                return
+        reader.expect("[")
+        if reader.peek() == "]":
+            return
+        while True:
+            yield reader.value()
+            if reader.peek() == ",":
+                reader.expect(",")
+                continue
+            reader.expect("]")
+            return
+
+
+_END = object()
+
+
+class _Failure:
+    def __init__(self, error):
+        self.error = error
+
+
+def read_ahead(iterable, maxsize):
+    """
+    Liest iterable in einem Hintergrund-Thread in eine begrenzte Queue und liefert
+    die Elemente in Reihenfolge weiter. Ist die Queue voll, wartet der Leser,
+    so bleibt der Speicherbedarf unabhängig von der Länge der Quelle.
+    Fehler der Quelle werden beim Verbraucher erneut ausgelöst.
+    """
+    items = queue.Queue(maxsize=max(1, maxsize))
+
+    def produce():
+        try:
+            for item in iterable:
+                items.put(item)
+        except Exception as e:
+            items.put(_Failure(e))
+        finally:
+            items.put(_END)
+
+    threading.Thread(target=produce, name="catalog-reader", daemon=True).start()
+    while True:
+        item = items.get()
+        if item is _END:
+            return
+        if isinstance(item, _Failure):
+            raise item.error
+        yield item
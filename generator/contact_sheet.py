@@ -0,0 +1,146 @@
+import os
+
+from PIL import Image, ImageDraw, ImageOps
+
+from .fonts import get_font
+from .model import resolve_font_path
+from .output import save_options
+from .preview import preview_config, preview_settings
+from .scene import write_json
+
+# Standardwerte für Kontaktbögen (überschreibbar über den Abschnitt "contact_sheet" der Config)
+CONTACT_SHEET_DEFAULTS = {
+    "dir": os.path.join("output", "contact_sheets"),
+    "tile_width": 810,
+    "columns": 3,
+    "rows": 8,
+    "gap": 12,
+    "labels": True,
+    "format": "jpeg",
+    "quality": 85,
+}
+
+LABEL_FONT = "Roboto-Regular.ttf"
+INDEX_FILE = "index.json"
+
+
+def contact_sheet_settings(config):
+    cfg = config.get("contact_sheet")
+    return {**CONTACT_SHEET_DEFAULTS, **(cfg if isinstance(cfg, dict) else {})}
+
+
+def tile_config(config):
+    """
+    Render-Config für eine Kachel: Vorschau-Rendering, dessen Breite genau tile_width ist.
+    Dadurch wird direkt klein gerendert statt in voller Größe und danach verkleinert.
+    """
+    settings = contact_sheet_settings(config)
+    width, _ = config.get("output_size", [3240, 1350])
+    preview = {**preview_settings(config), "scale": settings["tile_width"] / width}
+    return preview_config({**config, "preview": preview})
+
+
+class ContactSheetWriter:
+    """
+    Setzt verkleinerte Carousels zu Seiten mit columns × rows Kacheln zusammen.
+    Kacheln werden eingefügt, sobald ein Modul fertig ist; nur die aktuelle Seite liegt
+    im Speicher und wird einmal kodiert, wenn sie voll ist (bzw. bei close()).
+    index.json ordnet jeder Modul-ID Seite und Kachel-Koordinaten zu.
+    """
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.out_dir = settings["dir"]
+        self.ext, self.pil_format, self.params = save_options(settings)
+        self.columns = int(settings["columns"])
+        self.rows = int(settings["rows"])
+        self.gap = int(settings["gap"])
+        self.label_h = 28 if settings["labels"] else 0
+        self.tile_size = None
+        self.page = None
+        self.page_no = 0
+        self.slot = 0
+        self.sheets = []
+        self.modules = {}
+        os.makedirs(self.out_dir, exist_ok=True)
+
+    def _new_page(self):
+        tile_w, tile_h = self.tile_size
+        cell_h = tile_h + self.label_h
+        size = (self.columns * (tile_w + self.gap) + self.gap, self.rows * (cell_h + self.gap) + self.gap)
+        self.page = Image.new("RGB", size, (255, 255, 255))
+        self.page_no += 1
+        self.slot = 0
+
+    def sheet_name(self, page_no):
+        return f"sheet_{page_no:03d}{self.ext}"
+
+    def add(self, module_id, title, image, source=None):
+        """Fügt die Kachel eines fertigen Moduls ein und schreibt die Seite, sobald sie voll ist."""
+        if self.tile_size is None:
+            self.tile_size = image.size
+        if self.page is None:
+            self._new_page()
+        tile_w, tile_h = self.tile_size
+        col, row = self.slot % self.columns, self.slot // self.columns
+        x = self.gap + col * (tile_w + self.gap)
+        y = self.gap + row * (tile_h + self.label_h + self.gap)
+
+        tile = image.convert("RGB") if image.mode != "RGB" else image
+        if tile.size != self.tile_size:
+            tile = ImageOps.contain(tile, self.tile_size)
+        self.page.paste(tile, (x, y))
+        if self.label_h:
+            font = get_font(resolve_font_path(LABEL_FONT), 18)
+            label = f"{module_id} – {title}"
+            # Zu lange Beschriftungen kürzen, damit sie nicht in die Nachbarkachel laufen
+            while len(label) > 1 and font.getlength(label) > tile_w:
+                label = label[:-2] + "…"
+            ImageDraw.Draw(self.page).text((x, y + tile_h + 4), label, fill=(0, 0, 0), font=font)
+
+        key = module_id
+        n = 2
+        while key in self.modules:
+            key = f"{module_id}#{n}"
+            n += 1
+        self.modules[key] = {
+            "title": title,
+            "source": source,
+            "sheet": self.sheet_name(self.page_no),
+            "page": self.page_no,
+            "box": [x, y, tile_w, tile_h],
+        }
+
+        self.slot += 1
+        if self.slot >= self.columns * self.rows:
+            self.flush()
+
+    def flush(self):
+        """Kodiert die aktuelle Seite (einmal) und aktualisiert index.json."""
+        if self.page is None:
+            return
+        name = self.sheet_name(self.page_no)
+        path = os.path.join(self.out_dir, name)
+        # Letzte, nur teilweise gefüllte Seite auf die belegten Reihen zuschneiden
+        used_rows = -(-self.slot // self.columns)
+        if used_rows < self.rows:
+            cell_h = self.tile_size[1] + self.label_h + self.gap
+            self.page = self.page.crop((0, 0, self.page.width, used_rows * cell_h + self.gap))
+        self.page.save(path, format=self.pil_format, **self.params)
+        self.sheets.append(name)
+        print(f"🗂️  Kontaktbogen gespeichert: {path}")
+        self.page = None
+        self.write_index()
+
+    def write_index(self):
+        write_json(os.path.join(self.out_dir, INDEX_FILE), {
+            "tile_size": list(self.tile_size) if self.tile_size else None,
+            "columns": self.columns,
+            "rows": self.rows,
+            "sheets": self.sheets,
+            "modules": self.modules,
+        })
+
+    def close(self):
+        self.flush()
+        self.write_index()
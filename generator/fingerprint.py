@@ -3,7 +3,7 @@ import random
 from typing import List, Optional, Tuple
 from PIL import Image, ImageDraw
 
-DEFAULT_SIDES: List[str] = ["top", "right", "bottom", "left"]
+from .model import DEFAULT_SIDES
 
 
 def load_config(path: str) -> dict:
@@ -29,30 +29,58 @@ def load_config(path: str) -> dict:
     return config
 
 
-def create_zone_mask(img_width: int, img_height: int, zone_thickness: int, zone_count: int = 3, enabled_sides: Optional[List[str]] = None) -> Image.Image:
+def _mask_scale(img_width: int, img_height: int, mask_size: Optional[Tuple[int, int]]) -> Tuple[Tuple[int, int], float, float]:
+    """Zielgröße der Maske und Skalierungsfaktoren gegenüber der Original-Geometrie."""
+    if mask_size is None:
+        return (img_width, img_height), 1.0, 1.0
+    return tuple(mask_size), mask_size[0] / img_width, mask_size[1] / img_height
+
+
+def _scaled_rect(x0: int, y0: int, x1: int, y1: int, sx: float, sy: float) -> Optional[List[int]]:
+    """
+    Skaliert ein (inklusives) Pillow-Rechteck der Original-Geometrie auf die Maskengröße.
+    Gibt None zurück, wenn es dabei auf 0 Pixel schrumpft.
+    """
+    if sx == 1.0 and sy == 1.0:
+        return [x0, y0, x1, y1]
+    nx0, ny0 = round(x0 * sx), round(y0 * sy)
+    nx1, ny1 = round((x1 + 1) * sx) - 1, round((y1 + 1) * sy) - 1
+    if nx1 < nx0 or ny1 < ny0:
+        return None
+    return [nx0, ny0, nx1, ny1]
+
+
+def create_zone_mask(img_width: int, img_height: int, zone_thickness: int, zone_count: int = 3, enabled_sides: Optional[List[str]] = None, mask_size: Optional[Tuple[int, int]] = None) -> Image.Image:
     """
     Erstellt eine Graustufen-Maske mit weißen Bereichen in drei Zonen am Bildrand:
     oben, rechts, unten und links, jeweils mit der gegebenen zone_thickness.
+    mask_size: optionale kleinere Maskengröße; die Zonen-Geometrie bleibt die des Originalbilds.
     """
     if enabled_sides is None:
         enabled_sides = DEFAULT_SIDES.copy()
-    mask = Image.new("L", (img_width, img_height), 0)
+    size, sx, sy = _mask_scale(img_width, img_height, mask_size)
+    mask = Image.new("L", size, 0)
     draw = ImageDraw.Draw(mask)
+    rects = []
     for zone in range(zone_count):
         start = zone * zone_thickness
         end = start + zone_thickness
         # Obere Zone
         if "top" in enabled_sides:
-            draw.rectangle([0, start, img_width, end], fill=255)
+            rects.append([0, start, img_width, end])
         # Untere Zone
         if "bottom" in enabled_sides:
-            draw.rectangle([0, img_height - end, img_width, img_height - start], fill=255)
+            rects.append([0, img_height - end, img_width, img_height - start])
         # Linke Zone
         if "left" in enabled_sides:
-            draw.rectangle([start, 0, end, img_height], fill=255)
+            rects.append([start, 0, end, img_height])
         # Rechte Zone
         if "right" in enabled_sides:
-            draw.rectangle([img_width - end, 0, img_width - start, img_height], fill=255)
+            rects.append([img_width - end, 0, img_width - start, img_height])
+    for rect in rects:
+        rect = _scaled_rect(*rect, sx, sy)
+        if rect:
+            draw.rectangle(rect, fill=255)
     return mask
 
 
@@ -132,19 +160,22 @@ def create_grid_cutout_mask(
     rect_h: int,
     omit_chance: float,
     zone_count: int = 3,
-    enabled_sides: Optional[List[str]] = None
+    enabled_sides: Optional[List[str]] = None,
+    mask_size: Optional[Tuple[int, int]] = None
 ) -> Image.Image:
     """
     Erstellt eine Cut-Out-Maske mit einem Raster in jeder Zone.
     Zellengröße = rect_w × rect_h, omit_chance = Wahrscheinlichkeit, eine Zelle zu überspringen.
     Anzahl der Reihen/Spalten wird automatisch nach Zonengröße berechnet.
+    mask_size: optionale kleinere Maskengröße; Raster und Zufallszahlen bleiben die des Originalbilds.
     """
     if enabled_sides is None:
         enabled_sides = DEFAULT_SIDES.copy()
 
     # Basis-Zonenmaske (weiß in den erlaubten Zonen)
-    mask = create_zone_mask(img_width, img_height, zone_thickness, zone_count, enabled_sides)
+    mask = create_zone_mask(img_width, img_height, zone_thickness, zone_count, enabled_sides, mask_size)
     draw = ImageDraw.Draw(mask)
+    _, sx, sy = _mask_scale(img_width, img_height, mask_size)
 
     # Definition der Zonen-Rechtecke für jede Seite
     sides = {
@@ -173,11 +204,144 @@ def create_grid_cutout_mask(
                         break
                     if omit_chance > 0.0 and random.random() < omit_chance:
                         continue
-                    draw.rectangle([x, y, x + rect_w, y + rect_h], fill=0)
+                    rect = _scaled_rect(x, y, x + rect_w, y + rect_h, sx, sy)
+                    if rect:
+                        draw.rectangle(rect, fill=0)
 
     return mask
 
 
+def _grid_blocks(img_width: int, img_height: int, zone_thickness: int, rect_w: int, rect_h: int, zone_count: int, enabled_sides: List[str]) -> List[Tuple[int, int, int, int]]:
+    """
+    Liefert (x0, y0, rows, cols) je Zone und Seite in genau der Reihenfolge,
+    in der create_grid_cutout_mask die Zellen abläuft (Zone außen, dann Seite).
+    """
+    blocks = []
+    for zone in range(zone_count):
+        start = zone * zone_thickness
+        for side in enabled_sides:
+            if side == "top":
+                x0, y0, zone_w, zone_h = 0, start, img_width, zone_thickness
+            elif side == "bottom":
+                x0, y0, zone_w, zone_h = 0, img_height - (start + zone_thickness), img_width, zone_thickness
+            elif side == "left":
+                x0, y0, zone_w, zone_h = start, 0, zone_thickness, img_height
+            elif side == "right":
+                x0, y0, zone_w, zone_h = img_width - (start + zone_thickness), 0, zone_thickness, img_height
+            else:
+                raise KeyError(side)
+            blocks.append((x0, y0, zone_h // rect_h, zone_w // rect_w))
+    return blocks
+
+
+def _axis_cells(np, start: int, step: int, count: int, limit: int, scale: float = 1.0):
+    """
+    Ordnet jedem Pixel entlang einer Achse seine Rasterzelle zu.
+    Zelle c deckt [start + c*step, start + (c+1)*step + 1) ab (Pillow-Rechtecke schließen
+    den Endpunkt ein), benachbarte Zellen überlappen also um ein Pixel.
+    Mit scale != 1 werden die Zellgrenzen wie in _scaled_rect auf die Maskengröße gerundet.
+    Gibt (erstes Pixel, Zellindex + 1, Überlappung mit Vorgängerzelle) zurück oder None.
+    """
+    if count <= 0:
+        return None
+    cell_start = start + np.arange(count) * step
+    cell_end = cell_start + step + 1
+    if scale != 1.0:
+        cell_start = np.rint(cell_start * scale).astype(np.int64)
+        cell_end = np.rint(cell_end * scale).astype(np.int64)
+    lo = max(int(cell_start[0]), 0)
+    hi = min(int(cell_end[-1]), limit)
+    if hi <= lo:
+        return None
+    pixels = np.arange(lo, hi)
+    idx = np.searchsorted(cell_start, pixels, side="right") - 1
+    overlap = (idx >= 1) & (pixels < cell_end[np.maximum(idx - 1, 0)])
+    return lo, idx + 1, overlap
+
+
+def create_grid_cutout_mask_np(
+    img_width: int,
+    img_height: int,
+    zone_thickness: int,
+    rect_w: int,
+    rect_h: int,
+    omit_chance: float,
+    zone_count: int = 3,
+    enabled_sides: Optional[List[str]] = None,
+    seed_compatible: bool = True,
+    seed: Optional[int] = None,
+    mask_size: Optional[Tuple[int, int]] = None
+) -> Image.Image:
+    """
+    NumPy-Variante von create_grid_cutout_mask: Das Auslassen/Behalten aller Zellen
+    aller Zonen und Seiten wird in einem Array bestimmt und per Broadcasting in die Maske geschrieben.
+
+    seed_compatible=True zieht die Zufallszahlen aus dem globalen `random`-Modul in derselben
+    Reihenfolge wie die Pillow-Schleife und liefert damit pixelgenau dieselbe Maske.
+    Sonst wird ein eigener NumPy-Generator (mit `seed`) verwendet.
+    mask_size: wie bei create_grid_cutout_mask.
+    """
+    import numpy as np
+
+    if enabled_sides is None:
+        enabled_sides = DEFAULT_SIDES.copy()
+
+    blocks = _grid_blocks(img_width, img_height, zone_thickness, rect_w, rect_h, zone_count, enabled_sides)
+    total = sum(rows * cols for _, _, rows, cols in blocks)
+
+    # Flags aller Zellen aller Blöcke (True = Zelle wird ausgeschnitten, d. h. schwarz gezeichnet)
+    if omit_chance > 0.0 and total:
+        if seed_compatible:
+            draws = np.fromiter((random.random() for _ in range(total)), dtype=np.float64, count=total)
+        else:
+            draws = np.random.default_rng(seed).random(total)
+        cut = draws >= omit_chance
+    else:
+        cut = np.ones(total, dtype=bool)
+
+    (mask_w, mask_h), sx, sy = _mask_scale(img_width, img_height, mask_size)
+    mask = np.zeros((mask_h, mask_w), dtype=np.uint8)
+
+    def span(lo, hi, scale):
+        # Inklusives Intervall [lo, hi] der Original-Geometrie -> Slice der Maske
+        return slice(max(round(lo * scale), 0), max(round((hi + 1) * scale), 0))
+
+    # Basis-Zonen (weiß) wie in create_zone_mask
+    for zone in range(zone_count):
+        start = zone * zone_thickness
+        end = start + zone_thickness
+        if "top" in enabled_sides:
+            mask[span(start, end, sy), :] = 255
+        if "bottom" in enabled_sides:
+            mask[span(img_height - end, img_height - start, sy), :] = 255
+        if "left" in enabled_sides:
+            mask[:, span(start, end, sx)] = 255
+        if "right" in enabled_sides:
+            mask[:, span(img_width - end, img_width - start, sx)] = 255
+
+    # Ausgeschnittene Zellen je Block per Broadcasting schwarz setzen
+    offset = 0
+    for x0_zone, y0_zone, rows, cols in blocks:
+        grid = np.zeros((rows + 1, cols + 1), dtype=bool)  # Zeile/Spalte 0 = Padding
+        grid[1:, 1:] = cut[offset:offset + rows * cols].reshape(rows, cols)
+        offset += rows * cols
+        axis_y = _axis_cells(np, y0_zone, rect_h, rows, mask_h, sy)
+        axis_x = _axis_cells(np, x0_zone, rect_w, cols, mask_w, sx)
+        if axis_y is None or axis_x is None:
+            continue
+        y_lo, cy, oy = axis_y
+        x_lo, cx, ox = axis_x
+        # Erst Zeilen, dann Spalten expandieren (separabel, deutlich schneller als 2D-Indexing)
+        rows_px = grid.take(cy, axis=0)
+        rows_px |= oy[:, None] & grid.take(cy - 1, axis=0)
+        black = rows_px.take(cx, axis=1)
+        black |= ox & rows_px.take(cx - 1, axis=1)
+        region = mask[y_lo:y_lo + black.shape[0], x_lo:x_lo + black.shape[1]]
+        region[black] = 0
+
+    return Image.fromarray(mask)
+
+
 def apply_overlay(image_path: str, mask: Image.Image, background_color: Tuple[int, int, int, int]) -> Image.Image:
     """
     Wendet ein farbiges Overlay basierend auf der Maske an.
@@ -193,30 +357,124 @@ def apply_overlay(image_path: str, mask: Image.Image, background_color: Tuple[in
     # Overlay auf das Originalbild anwenden
     return Image.alpha_composite(original, overlay)
 
-def build_masked_fingerprint_image(fingerprint_config: dict) -> Image.Image:
+# Ab so vielen Rasterzellen ist die NumPy-Engine schneller als die Pillow-Schleife;
+# darunter dominiert der feste Aufwand für das Masken-Array (siehe benchmarks, grid_mask)
+NUMPY_MIN_CELLS = 10000
+
+
+def grid_cell_count(img_width: int, img_height: int, zone_thickness: int, rect_w: int, rect_h: int, zone_count: int, enabled_sides: List[str]) -> int:
+    """Anzahl der Rasterzellen, die create_grid_cutout_mask für diese Geometrie abläuft."""
+    blocks = _grid_blocks(img_width, img_height, zone_thickness, rect_w, rect_h, zone_count, enabled_sides)
+    return sum(rows * cols for _, _, rows, cols in blocks)
+
+
+def resolve_mask_engine(engine: str, cells: Optional[int] = None) -> str:
+    """
+    Wählt die Masken-Engine: "numpy", "pillow" oder "auto"
+    ("auto" = NumPy erst ab NUMPY_MIN_CELLS Rasterzellen und falls installiert, sonst die Pillow-Schleife;
+    ohne bekannte Zellenzahl immer Pillow).
+    """
+    if engine == "pillow":
+        return "pillow"
+    if engine == "auto" and (cells is None or cells < NUMPY_MIN_CELLS):
+        return "pillow"
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        if engine == "numpy":
+            print("[WARN] NumPy ist nicht installiert, Fingerprint-Maske wird mit Pillow erzeugt")
+        return "pillow"
+    return "numpy"
+
+
+def fingerprint_mask_engine(fingerprint_config: dict, image_size: Tuple[int, int]) -> str:
+    """Masken-Engine, die build_masked_fingerprint_image für diese Config und Bildgröße verwendet."""
+    base = fingerprint_config.get("base_size")
+    cells = grid_cell_count(
+        image_size[0], image_size[1], base, base, base,
+        fingerprint_config.get("zone_count", 3),
+        fingerprint_config.get("enabled_sides", DEFAULT_SIDES)
+    )
+    return resolve_mask_engine(fingerprint_config.get("mask_engine", "auto"), cells)
+
+
+def contain_size(size: Tuple[int, int], box: Tuple[int, int]) -> Tuple[int, int]:
+    """Größe, die ImageOps.contain(image, box) für ein Bild der Größe `size` liefern würde."""
+    width, height = size
+    im_ratio = width / height
+    dest_ratio = box[0] / box[1]
+    if im_ratio != dest_ratio:
+        if im_ratio > dest_ratio:
+            new_height = round(height / width * box[0])
+            if new_height != box[1]:
+                return box[0], new_height
+        else:
+            new_width = round(width / height * box[1])
+            if new_width != box[0]:
+                return new_width, box[1]
+    return tuple(box)
+
+
+# Maximaler Supersampling-Faktor der Maske bei verkleinertem Rendern (glatte Zellkanten)
+MASK_SUPERSAMPLING = 4
+
+
+def build_masked_fingerprint_image(fingerprint_config: dict, target_size: Optional[Tuple[int, int]] = None) -> Image.Image:
     """
     Erzeugt das finale Fingerprint-Bild basierend auf den Konfigurationsdaten.
     Gibt ein RGBA-Bild zurück.
+
+    target_size: Box, in die das Ergebnis später per ImageOps.contain eingepasst wird.
+    Ist sie kleiner als das Eingabebild, wird das JPEG per Draft-Modus verkleinert dekodiert
+    und Maske sowie Overlay direkt in Zielgröße berechnet (Raster und Zufallszahlen bleiben gleich).
+    Mit "prescale": false wird wie bisher in voller Auflösung gerechnet.
     """
-    from .generator import parse_color  # falls nötig für Farbumwandlung
 
     random_seed = fingerprint_config.get("random_seed")
     if random_seed is not None:
         random.seed(int(random_seed))
 
-    image = Image.open(fingerprint_config["input_image"]).convert("RGBA")
+    image = Image.open(fingerprint_config["input_image"])
+    src_w, src_h = image.size
+    out_size = None
+    if target_size and fingerprint_config.get("prescale", True):
+        out_size = contain_size(image.size, target_size)
+        if out_size[0] >= src_w or out_size[1] >= src_h:
+            out_size = None
+
+    if out_size:
+        # JPEG nur in der nötigen Auflösung dekodieren (1/2, 1/4, 1/8), dann exakt skalieren
+        image.draft("RGB", out_size)
+        image = image.convert("RGB").resize(out_size, Image.BICUBIC).convert("RGBA")
+        supersampling = max(1, min(MASK_SUPERSAMPLING, int(src_w / out_size[0])))
+        mask_size = (out_size[0] * supersampling, out_size[1] * supersampling)
+    else:
+        image = image.convert("RGBA")
+        mask_size = None
+
     rect_width = fingerprint_config.get("base_size")
     rect_height = fingerprint_config.get("base_size")
-    mask = create_grid_cutout_mask(
-        img_width=image.width,
-        img_height=image.height,
+    mask_args = dict(
+        img_width=src_w,
+        img_height=src_h,
         zone_thickness=fingerprint_config.get("base_size"),
         rect_w=rect_width,
         rect_h=rect_height,
         omit_chance=fingerprint_config.get("grid", {}).get("omit_chance", 0.3),
         zone_count=fingerprint_config.get("zone_count", 3),
-        enabled_sides=fingerprint_config.get("enabled_sides", ["top", "right", "bottom", "left"])
+        enabled_sides=fingerprint_config.get("enabled_sides", ["top", "right", "bottom", "left"]),
+        mask_size=mask_size
     )
+    if fingerprint_mask_engine(fingerprint_config, (src_w, src_h)) == "numpy":
+        mask = create_grid_cutout_mask_np(
+            **mask_args,
+            seed_compatible=fingerprint_config.get("seed_compatible", True),
+            seed=random_seed
+        )
+    else:
+        mask = create_grid_cutout_mask(**mask_args)
+    if mask.size != image.size:
+        mask = mask.resize(image.size, Image.BOX)
     bg_color = fingerprint_config.get("background_color", [255, 255, 255])
     if len(bg_color) == 3:
         overlay_color = tuple(bg_color) + (255,)
@@ -0,0 +1,87 @@
+import os
+
+from .cache import ImageLRUCache, cache_dir, cache_settings, config_digest, file_digest, load_cached_image, store_cached_image
+
+# Prozessweiter Speicher fertiger Fingerprint-Bilder (Größe über cache.fingerprint_memory_mb)
+memory_cache = ImageLRUCache(256 * 1024 * 1024)
+disk_stats = {"hits": 0, "writes": 0}
+
+
+def normalize_fingerprint_config(fingerprint_config, output_size=None):
+    """
+    Reduziert die Fingerprint-Config auf die Werte, die das fertige Bild bestimmen
+    (mit eingesetzten Standardwerten), damit gleiche Hintergründe denselben Schlüssel erhalten.
+    Das Eingabebild geht über seinen Content-Hash ein, nicht über den Pfad.
+    """
+    from PIL import Image
+
+    from .fingerprint import DEFAULT_SIDES, fingerprint_mask_engine
+
+    seed_compatible = bool(fingerprint_config.get("seed_compatible", True))
+    if not seed_compatible:
+        # Die Pillow-Engine zieht immer aus dem globalen random-Modul
+        with Image.open(fingerprint_config["input_image"]) as image:
+            seed_compatible = fingerprint_mask_engine(fingerprint_config, image.size) == "pillow"
+    bg_color = list(fingerprint_config.get("background_color", [255, 255, 255]))
+    if len(bg_color) == 3:
+        bg_color.append(255)
+    return {
+        "input_image": file_digest(fingerprint_config["input_image"]),
+        "base_size": int(fingerprint_config.get("base_size")),
+        "zone_count": int(fingerprint_config.get("zone_count", 3)),
+        "enabled_sides": list(fingerprint_config.get("enabled_sides", DEFAULT_SIDES)),
+        "omit_chance": float(fingerprint_config.get("grid", {}).get("omit_chance", 0.3)),
+        "random_seed": int(fingerprint_config["random_seed"]),
+        "seed_compatible": seed_compatible,
+        "background_color": [int(c) for c in bg_color],
+        "prescale": bool(fingerprint_config.get("prescale", True)),
+        "output_size": list(output_size) if output_size else None,
+    }
+
+
+def load_fingerprint_image(config, fingerprint_config, target_size=None):
+    """
+    Wie build_masked_fingerprint_image, aber mit LRU-Cache im Speicher und optional auf der Platte.
+    Ohne random_seed ist das Ergebnis zufällig und wird deshalb nie gecacht.
+    Das zurückgegebene Bild ist geteilt und darf nicht verändert werden.
+    """
+    # fingerprint.py (und damit Pillow) erst laden, wenn tatsächlich ein Fingerprint gebraucht wird
+    from .fingerprint import build_masked_fingerprint_image, contain_size
+
+    settings = cache_settings(config)
+    if not settings.get("fingerprint", True) or fingerprint_config.get("random_seed") is None:
+        return build_masked_fingerprint_image(fingerprint_config, target_size)
+
+    memory_cache.max_bytes = int(settings.get("fingerprint_memory_mb", 256) * 1024 * 1024)
+    # Nur die tatsächliche Ausgabegröße zählt, nicht die Box (ohne prescale ist sie egal)
+    key_size = None
+    if target_size and fingerprint_config.get("prescale", True):
+        key_size = contain_size(_image_size(fingerprint_config["input_image"]), target_size)
+    key = config_digest(normalize_fingerprint_config(fingerprint_config, key_size))
+
+    image = memory_cache.get(key)
+    if image is not None:
+        return image
+
+    disk_path = None
+    if settings.get("fingerprint_disk", True):
+        disk_path = os.path.join(cache_dir(config, "fingerprint"), f"{key}.png")
+        image = load_cached_image(disk_path)
+        if image is not None:
+            disk_stats["hits"] += 1
+            memory_cache.put(key, image)
+            return image
+
+    image = build_masked_fingerprint_image(fingerprint_config, target_size)
+    memory_cache.put(key, image)
+    if disk_path:
+        store_cached_image(disk_path, image)
+        disk_stats["writes"] += 1
+    return image
+
+
+def _image_size(path):
+    from PIL import Image
+
+    with Image.open(path) as image:
+        return image.size
@@ -0,0 +1,57 @@
+import io
+import os
+import threading
+
+# Prozessweite Font-Registry: jede TTF-Datei wird einmal gelesen,
+# jede (Datei, Pixelgröße, Layout-Engine)-Kombination einmal geparst.
+_font_bytes = {}
+_fonts = {}
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "file_loads": 0}
+
+
+def _read_font_file(path):
+    data = _font_bytes.get(path)
+    if data is None:
+        with open(path, "rb") as f:
+            data = f.read()
+        _font_bytes[path] = data
+        _stats["file_loads"] += 1
+    return data
+
+
+def get_font(font_path, size, layout_engine=None):
+    """
+    Liefert ein geteiltes FreeTypeFont-Objekt für (Pfad, Pixelgröße, Layout-Engine).
+    Ersetzt ImageFont.truetype überall dort, wo dieselben Fonts wiederholt gebraucht werden.
+    """
+    path = os.path.realpath(font_path)
+    key = (path, int(size), layout_engine)
+    font = _fonts.get(key)
+    if font is not None:
+        _stats["hits"] += 1
+        return font
+    with _lock:
+        font = _fonts.get(key)
+        if font is None:
+            from PIL import ImageFont
+
+            data = _read_font_file(path)
+            font = ImageFont.truetype(io.BytesIO(data), int(size), layout_engine=layout_engine)
+            _fonts[key] = font
+            _stats["misses"] += 1
+        else:
+            _stats["hits"] += 1
+    return font
+
+
+def font_cache_stats():
+    """Treffer/Fehlschläge der Registry sowie Anzahl geladener Dateien und Font-Objekte."""
+    return {**_stats, "fonts": len(_fonts), "files": len(_font_bytes)}
+
+
+def clear_font_cache():
+    """Leert die Registry (z. B. wenn Font-Dateien im Watch-Modus geändert wurden)."""
+    with _lock:
+        _fonts.clear()
+        _font_bytes.clear()
@@ -1,123 +1,41 @@
 import os
-import json
-from PIL import Image, ImageFont, ImageColor, ImageDraw
 
 # Fingerprint-Bildgenerator importieren
-from .fingerprint import build_masked_fingerprint_image
-
-# Globale Farbpalette laden
-base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-palette_path = os.path.join(base_dir, "assets", "color_palettes", "palette.json")
-
-with open(palette_path, encoding="utf-8") as f:
-    palette = json.load(f)
-
-# Basis-Asset-Pfade korrekt auflösen
-fonts_dir = os.path.join(base_dir, "assets", "fonts")
-prof_pictures_dir = os.path.join(base_dir, "assets", "prof_pictures")
-backgrounds_dir = os.path.join(base_dir, "assets", "backgrounds_fingerprint")
-def parse_color(val):
+from .background_cache import load_background_layer
+from .fingerprint_cache import load_fingerprint_image
+from . import render_cache
+from .fonts import get_font
+from .photos import load_lecturer_image
+from .model import FIT_MIN_SIZE, compile_module
+from .output import encode_carousel, save_carousel, save_slices
+from .preview import is_preview
+from .profiles import can_derive, resample_pyramid
+from .instrument import stage
+from .scene import SCENE_VERSION, layout_key, load_layout, store_layout, write_json
+from .hyphenation import get_hyphenator
+from .text_layout import largest_fitting, layout_lines, layout_lines_char_split, text_height
+
+def fit_text(draw, text, font_path, initial_size, max_width, max_height, min_size=FIT_MIN_SIZE, step=2, spacing=4):
     """
-    Wandelt eine Farbangabe in ein RGB-Tupel um.
-    - val: entweder hex "#RRGGBB", ein Palette-Schlüssel oder ein RGB-Tupel/Liste
+    Bricht Text um und passt Schriftgröße an.
+    Sucht binär die größte Größe aus initial_size, initial_size - step, …, min_size,
+    bei der der umbrochene Text in max_width × max_height passt.
     """
-    if not val:
-        # Default schwarz, falls kein Wert
-        return tuple(palette.get("black", [0,0,0]))
-    if isinstance(val, str):
-        if val.startswith("#"):
-            return ImageColor.getrgb(val)
-        return tuple(palette.get(val, [255, 255, 255]))
-    # Annahme: Liste/Tupel
-    return tuple(val)
-
-def fit_text(draw, text, font_path, initial_size, max_width, max_height, min_size=10, step=2, spacing=4):
-    """Bricht Text um und passt Schriftgröße an."""
-    size = initial_size
-    while size >= min_size:
-        font = ImageFont.truetype(font_path, size)
-        lines = []
-        line = ""
-        # build wrapped lines with word-splitting for very long words
-        for word in text.split():
-            # if word itself too wide, split into character chunks
-            bbox_word = draw.textbbox((0,0), word, font=font)
-            if bbox_word[2] > max_width:
-                part = ""
-                for ch in word:
-                    test = part + ch
-                    if draw.textbbox((0,0), test, font=font)[2] <= max_width:
-                        part = test
-                    else:
-                        if line:
-                            lines.append(line)
-                            line = ""
-                        lines.append(part)
-                        part = ch
-                if part:
-                    if line:
-                        line += " " + part
-                    else:
-                        line = part
-                continue
-            # normal wrap at spaces
-            test_line = (line + " " if line else "") + word
-            bbox_test = draw.textbbox((0,0), test_line, font=font)
-            if bbox_test[2] <= max_width:
-                line = test_line
-            else:
-                if line:
-                    lines.append(line)
-                line = word
-        if line:
-            lines.append(line)
-        # Gesamt-Höhe der Zeilen berechnen
-        total_h = sum(
-            draw.textbbox((0,0), ln, font=font)[3] - draw.textbbox((0,0), ln, font=font)[1]
-            for ln in lines
-        ) + spacing * (len(lines)-1)
-        if total_h <= max_height:
-            return font, "\n".join(lines)
-        size -= step
+    sizes = list(range(initial_size, min_size - 1, -step))
+
+    def layout(size):
+        lines = layout_lines_char_split(text, get_font(font_path, size), max_width)
+        return lines if text_height(lines, spacing) <= max_height else None
+
+    size, lines = largest_fitting(sizes, layout)
+    if size is not None:
+        return get_font(font_path, size), "\n".join(ln.text for ln in lines)
     # fallback: kleinste Schriftgröße, kein Umbruch
-    return ImageFont.truetype(font_path, min_size), text
+    return get_font(font_path, min_size), text
 
 def wrap_text(draw, text, font, max_width, hyphenator=None, hyphen="-"):
     """Umbricht Text an Wortgrenzen und trennt lange Wörter mit Hyphenation."""
-    # Vorab: Falls Hyphenation aktiv, zerlege lange Wörter in Silben
-    raw_words = text.split()
-    words = []
-    for word in raw_words:
-        if hyphenator and draw.textbbox((0,0), word, font=font)[2] > max_width:
-            # Höchstens einmal trennen: nimm letzte mögliche Silbengrenze
-            positions = hyphenator.positions(word)
-            split_pos = None
-            for pos in reversed(positions):
-                part = word[:pos] + hyphen
-                if draw.textbbox((0,0), part, font=font)[2] <= max_width:
-                    split_pos = pos
-                    break
-            if split_pos:
-                words.append(word[:split_pos] + hyphen)
-                words.append(word[split_pos:])
-            else:
-                words.append(word)
-        else:
-            words.append(word)
-
-    lines = []
-    current = ""
-    for w in words:
-        test_line = (current + " " if current else "") + w
-        if draw.textbbox((0,0), test_line, font=font)[2] <= max_width:
-            current = test_line
-        else:
-            if current:
-                lines.append(current)
-            current = w
-    if current:
-        lines.append(current)
-    return lines
+    return [line.text for line in layout_lines(text, font, max_width, hyphenator, hyphen)]
 
 def draw_centered_text(draw, rect, text, font, fill):
     """Zeichnet Einzeiler zentriert in Rechteck."""
@@ -147,6 +65,7 @@ def place_professor(canvas, prof_image, target_center, head_width):
     w, h = prof_image.size
     scale = head_width / w
     new_size = (int(w * scale), int(h * scale))
+    from PIL import Image
     prof_resized = prof_image.resize(new_size, Image.LANCZOS)
 
     # Position berechnen (Mittelpunkt)
@@ -158,24 +77,21 @@ def place_professor(canvas, prof_image, target_center, head_width):
     return paste_x, paste_y, new_size[0], new_size[1]
 
 # ===== Hilfsfunktion: Dynamische Box mit Text =====
-def draw_text_box(draw, x0, x1, y_ref, text, font, box_fill, outline, radius, padding, line_spacing, text_fill, show_box=True, hyphenator=None, hyphen="-", align_y="center", offset_x=0, offset_y=0):
+def layout_text_box(x0, x1, y_ref, text, font, padding, line_spacing, hyphenator=None, hyphen="-", align_y="center", offset_x=0, offset_y=0):
     """
-    Zeichnet eine gerundete Box um den mehrzeiligen Text und schreibt den Text zentriert hinein.
-    x0, x1: horizontale Slice-Grenzen
-    y_center: vertikaler Mittelpunkt der Box
-    text: String (bereits ggf. mit wrap_text aufgeteilt)
-    font: PIL-Font
-    fill, outline, radius, padding, line_spacing: Box-Styling
+    Berechnet Box und Zeilenpositionen für draw_text_box, ohne zu zeichnen.
+    Gibt ([x0, y0, x1, y1], [[Zeile, x, y], ...]) zurück oder None, wenn nichts zu zeichnen ist.
     """
     # Bei leerem Text nichts zeichnen
     if not text or not text.strip():
         return None
-    # Wortumbruch
+    # Wortumbruch (liefert Zeilen samt Bounding Boxes, kein erneutes Messen nötig)
     max_w = x1 - x0 - 2 * padding
-    lines = wrap_text(draw, text, font, max_w, hyphenator, hyphen)
+    lines = layout_lines(text, font, max_w, hyphenator, hyphen)
+    bboxes = [ln.bbox for ln in lines]
     # Zeilenmaße
-    heights = [draw.textbbox((0,0), ln, font=font)[3] - draw.textbbox((0,0), ln, font=font)[1] for ln in lines]
-    widths  = [draw.textbbox((0,0), ln, font=font)[2] - draw.textbbox((0,0), ln, font=font)[0] for ln in lines]
+    heights = [b[3] - b[1] for b in bboxes]
+    widths  = [b[2] - b[0] for b in bboxes]
     total_h = sum(heights) + line_spacing * (len(lines)-1)
     box_h   = total_h + 2 * padding
     box_w   = (max(widths) if widths else 0) + 2 * padding
@@ -193,21 +109,7 @@ def draw_text_box(draw, x0, x1, y_ref, text, font, box_fill, outline, radius, pa
     box_y0 += offset_y
     box_x1 = box_x0 + box_w
     box_y1 = box_y0 + box_h
-    # Debug-Ausgabe vor Box-Zeichnung
-    # Box zeichnen
-    if show_box:
-        draw.rounded_rectangle(
-            [(box_x0, box_y0), (box_x1, box_y1)],
-            radius=radius,
-            fill=box_fill,
-            outline=outline,
-            width=4
-        )
-    # Text zeichnen mit konsistenter Zeilenhöhe
-    # Vorberechnung: bboxes und Zeilenhöhen
-    bboxes = [draw.textbbox((0, 0), ln, font=font) for ln in lines]
-    heights = [b[3] - b[1] for b in bboxes]
-    widths = [b[2] - b[0] for b in bboxes]
+    # Zeilen mit konsistenter Zeilenhöhe setzen
     if heights:
         max_h = max(heights)
         # Korrektur für y-Start basierend auf kleinstem bbox[1]
@@ -217,339 +119,507 @@ def draw_text_box(draw, x0, x1, y_ref, text, font, box_fill, outline, radius, pa
         max_h = 0
         offset = padding
 
+    placed = []
     for idx, ln in enumerate(lines):
-        bbox = bboxes[idx]
-        text_w = widths[idx]
         # Horizontale Zentrierung
-        tx = box_x0 + (box_w - text_w) / 2
+        tx = box_x0 + (box_w - widths[idx]) / 2
         # Vertikale Position mit konsistenter Zeilenhöhe
         ty = box_y0 + offset
-        draw.text((tx, ty), ln, fill=text_fill, font=font)
+        placed.append([ln.text, tx, ty])
         # Zeilen-Offset aktualisieren
         offset += max_h + line_spacing
+    return [box_x0, box_y0, box_x1, box_y1], placed
+
+def draw_text_box(draw, x0, x1, y_ref, text, font, box_fill, outline, radius, padding, line_spacing, text_fill, show_box=True, hyphenator=None, hyphen="-", align_y="center", offset_x=0, offset_y=0):
+    """
+    Zeichnet eine gerundete Box um den mehrzeiligen Text und schreibt den Text zentriert hinein.
+    x0, x1: horizontale Slice-Grenzen
+    y_center: vertikaler Mittelpunkt der Box
+    text: String (bereits ggf. mit wrap_text aufgeteilt)
+    font: PIL-Font
+    fill, outline, radius, padding, line_spacing: Box-Styling
+    """
+    box = layout_text_box(x0, x1, y_ref, text, font, padding, line_spacing, hyphenator, hyphen, align_y, offset_x, offset_y)
+    if box is None:
+        return None
+    (box_x0, box_y0, box_x1, box_y1), lines = box
+    if show_box:
+        draw.rounded_rectangle(
+            [(box_x0, box_y0), (box_x1, box_y1)],
+            radius=radius,
+            fill=box_fill,
+            outline=outline,
+            width=4
+        )
+    for line, tx, ty in lines:
+        draw.text((tx, ty), line, fill=text_fill, font=font)
     return (box_x0, box_y0, box_x1, box_y1)
 
-# === Hauptfunktion ===
+# === Layout (Szene) ===
 
-def create_socialmedia_carousel(config):
-    # Modul-Konfiguration extrahieren
-    if 'modules' in config and isinstance(config['modules'], list) and config['modules']:
-        module_config = config['modules'][0]
-    else:
-        module_config = config
-    # Falls Module selbst nochmals in module_config geschachtelt sind, entpacken
-    if isinstance(module_config, dict) and 'modules' in module_config and isinstance(module_config['modules'], list) and module_config['modules']:
-        module_config = module_config['modules'][0]
-
-    module_id = module_config.get('id', module_config.get('title', 'unknown'))
-
-    # Display-Flags aus Modul-Config
-    disp = module_config.get("display", {})
-    show_title_box     = disp.get("title_box", config.get("slice1_title_box_enabled", False))
-    show_info1_box     = disp.get("info_box",   config.get("slice1_box_enabled",    False))
-    show_semester_box  = disp.get("semester_box",config.get("slice1_semester_box_enabled", True))
-    show_lecturer_box  = disp.get("lecturer_box",config.get("slice2_box_enabled",    True))
-    show_info3_box     = disp.get("footer_box",  config.get("slice3_box_enabled",    True))
-
-    # Offsets aus Modul-Config
-    offs = module_config.get("offsets", {})
-    off1 = offs.get("slice1", {})
-    t_off_x, t_off_y = off1.get("title", [0,0])
-    i1_off_x, i1_off_y = off1.get("info",  [0,0])
-    sem_off_x, sem_off_y = off1.get("semester", [0,0])
-    off2 = offs.get("slice2", {})
-    lect_off_x, lect_off_y = off2.get("lecturer", [0, 0])
-    off3 = offs.get("slice3", {})
-    i3_off_x, i3_off_y = off3.get("info", [0,0])
-    # 1) Canvas erstellen
-    width, height = config.get("output_size", [3240, 1350])
-    base_w, base_h = 3240, 1350
-    scale_w = width / base_w
-    scale_h = height / base_h
-    scale = min(scale_w, scale_h)
-    slices = config.get("slice_count", 3)
-    full = Image.new("RGBA", (width, height), (0, 0, 0, 0))
-
-    # 2) Hintergrund setzen
-
-    # Hintergrundfarbe ermitteln: bevorzugt aus Modul-Config, sonst aus Hauptconfig
-    mod_bg_cfg = module_config.get("background", {})
-    if isinstance(mod_bg_cfg, dict) and mod_bg_cfg.get("type") == "palette":
-        bg_color_key = mod_bg_cfg.get("value")
-    else:
-        bg = config.get("background", {})
-        bg_color_key = bg.get("value")
-    palette_overrides = module_config.get("palette_overrides") or {}
-    box_color_keys  = palette_overrides.get("boxes", module_config.get("box_colors", {}))
-    module_text_colors = module_config.get("text_colors", {})
-    text_color_keys = palette_overrides.get("text", module_text_colors)
-    # Standard-Textfarbe aus Palette
-    default_text_color = tuple(palette.get("black", [0,0,0]))
-    def get_text_color(key):
-        color_key = text_color_keys.get(key)
-        if not color_key:
-            return default_text_color
-        return parse_color(color_key)
-
-    # === ursprünglicher Farb-Background entfernt ===
-
-    # === neuer Hintergrund: Fingerprint-Bild als Hintergrundbild ===
-    draw = ImageDraw.Draw(full)  # Zeichenobjekt wird dennoch gebraucht
-    fingerprint_config = module_config.get("fingerprint")
-    if fingerprint_config and fingerprint_config.get("enabled", False):
-        try:
-            fp_img = build_masked_fingerprint_image(fingerprint_config)
-            fp_mode = fingerprint_config.get("background_mode", "inset")  # "inset" oder "centered"
-
-            if fp_mode == "centered":
-                from PIL import ImageOps
-                fp_resized = ImageOps.contain(fp_img, (width, height))
-                fp_w, fp_h = fp_resized.size
-                paste_x = (width - fp_w) // 2
-                paste_y = (height - fp_h) // 2
-                col = parse_color(bg_color_key)
-                draw.rectangle([(0, 0), (width, height)], fill=col)
-                fp_alpha = fp_resized.copy()
-                fp_alpha_val = fingerprint_config.get("background_alpha", 200)
-                fp_alpha.putalpha(fp_alpha_val)
-                full.paste(fp_alpha, (paste_x, paste_y), fp_alpha)
-
-            # Fingerprint-Bild unten links mit optionaler Skalierung einfügen
-            elif fp_mode == "inset":
-                from PIL import ImageOps
-                col = parse_color(bg_color_key)
-                draw.rectangle([(0, 0), (width, height)], fill=col)
-                max_fp_width  = fingerprint_config.get("fingerprint_max_width", width // 3)
-                max_fp_height = fingerprint_config.get("fingerprint_max_height", height // 2)
-                fp_scaled = ImageOps.contain(fp_img, (max_fp_width, max_fp_height))
-                pos_x = fingerprint_config.get("fingerprint_offset_x", 50)
-                pos_y = fingerprint_config.get("fingerprint_offset_y", height - fp_scaled.height - 50)
-                full.paste(fp_scaled, (pos_x, pos_y), fp_scaled)
-
-            else:
-                print(f"[WARN] Unbekannter background_mode '{fp_mode}', fallback auf 'inset'")
-                col = parse_color(bg_color_key)
-                draw.rectangle([(0, 0), (width, height)], fill=col)
-                pos_x = fingerprint_config.get("fingerprint_offset_x", 50)
-                pos_y = fingerprint_config.get("fingerprint_offset_y", height - fp_img.height - 50)
-                full.paste(fp_img, (pos_x, pos_y), fp_img)
-
-        except Exception as e:
-            print(f"[WARN] Fingerprint-Hintergrund konnte nicht geladen werden: {e}")
-    else:
-        # Fingerprint ist deaktiviert – trotzdem Hintergrundfarbe ausfüllen!
-        col = parse_color(bg_color_key)
-        draw.rectangle([(0, 0), (width, height)], fill=col)
+def scene_font(spec):
+    """Font eines Szenen-Eintrags: [Pfad, Größe] oder None für die Pillow-Standardschrift."""
+    if spec is None:
+        from PIL import ImageFont
+        return ImageFont.load_default()
+    return get_font(spec[0], spec[1])
+
+def layout_carousel(module):
+    """
+    Reiner Layout-Schritt: berechnet Boxen, umbrochene Zeilen, Font-Schlüssel und
+    Bildplatzierungen eines kompilierten Moduls (siehe model.py), ohne Pixel zu erzeugen.
+    Farben stehen nur als Rollen ("box:slice1", "text:title") im Ergebnis und werden
+    erst in build_scene eingesetzt. Das Ergebnis ist JSON-serialisierbar (siehe scene.py).
+    """
+    # 1) Canvas-Maße
+    canvas = module.canvas
+    width, height = canvas.width, canvas.height
+    scale = canvas.scale
+    slice_w = canvas.slice_w
+    texts = module.texts
 
     # Hyphenation optional konfigurieren
-    hyphenation_config = config.get("hyphenation", {})
-    hyphenator = None
-    if hyphenation_config.get("enabled", False):
-        import pyphen
-        lang = hyphenation_config.get("lang", "de_DE")
-        hyphen = hyphenation_config.get("hyphen", "-")
-        hyphenator = pyphen.Pyphen(lang=lang)
-
-    # 3) Schriftarten laden (Modul-Config)
-    font_config = module_config.get("fonts", {})
-    def load_font(key, default_path, default_size):
-        spec = font_config.get(key, {})
-        size = spec.get("size", default_size)
-        font_path = spec.get("path", default_path)
-        if not os.path.isabs(font_path):
-            font_path = os.path.join(fonts_dir, os.path.basename(font_path))
-        return ImageFont.truetype(font_path, int(size * scale))
-    try:
-        font_title    = load_font("title",    config.get("title_font_path", "assets/fonts/Roboto-Bold.ttf"), config.get("title_font_size", 80))
-        font_slice1   = load_font("slice1_info", config.get("slice1_info_font_path", "assets/fonts/Roboto-Regular.ttf"), config.get("slice1_info_font_size", 48))
-        font_semester = load_font("semester", config.get("semester_font_path", "assets/fonts/Roboto-Bold.ttf"), config.get("semester_font_size", 60))
-        font_lecturer = load_font("lecturer", config.get("lecturer_font_path", "assets/fonts/Roboto-Regular.ttf"), config.get("lecturer_font_size", 48))
-        font_slice3   = load_font("slice3_info", config.get("slice3_info_font_path", "assets/fonts/Roboto-Regular.ttf"), config.get("slice3_info_font_size", 48))
-    except:
-        font_title = font_slice1 = font_semester = font_lecturer = font_slice3 = ImageFont.load_default()
-
-    # Spacings aus Modul-Config
-    spacings = module_config.get("spacings", {})
-    sp1 = spacings.get("slice1", {})
-    title_ls = int(sp1.get("title", {}).get("line_spacing", 10) * scale)
-    title_pad= int(sp1.get("title", {}).get("padding",      0) * scale)
-    info_ls  = int(sp1.get("info",  {}).get("line_spacing", 10) * scale)
-    info_pad = int(sp1.get("info",  {}).get("padding",      50) * scale)
-    sem_marg = spacings.get("semester", {}).get("margin", [50, 50])
-    sp3 = spacings.get("slice3", {})
-    info3_ls  = int(sp3.get("info", {}).get("line_spacing", config.get("slice3_line_spacing", 10)) * scale)
-    box3_yoff = sp3.get("box_y_offset", config.get("slice3_box_y_offset", 0))
-    box3_yoff = int(box3_yoff * scale)
-
-    # 4) Modul-Bilder einfügen
-    # (Entfernt: bottom_image-Block zur Vermeidung kleiner Icons/Punkte)
-
-    # Dozentenbild: flexibel fithten und positionieren
-    # Modul-spezifische Lecturer-Einstellungen
-    lect_cfg = module_config.get("lecturer", {})
-    photo_path = lect_cfg.get("photo")
-    if photo_path and not os.path.isabs(photo_path):
-        photo_path = os.path.join(prof_pictures_dir, os.path.basename(photo_path))
-    if photo_path and not os.path.exists(photo_path):
-        pass
-    if photo_path and os.path.exists(photo_path):
-        target_w    = int(lect_cfg.get("target_width", 400) * scale)
-        target_h    = int(lect_cfg.get("target_height", 400) * scale)
-        # Pfad wird aus lect_cfg["photo"] geladen
-        prof_img = Image.open(photo_path).convert("RGBA")
-        w, h = prof_img.size
-        # Always use "contain" mode
-        ratio = min(target_w / w, target_h / h)
-        new_size = (int(w * ratio), int(h * ratio))
-        resized = prof_img.resize(new_size, Image.LANCZOS)
-        # Dozentenbild rechteckig und ohne Maske einfügen
-        # Dozentenbild rechteckig mit transparentem Hintergrund einfügen
-        canvas_img = Image.new("RGBA", (target_w, target_h), (0, 0, 0, 0))
-        paste_pos = ((target_w - new_size[0]) // 2, (target_h - new_size[1]) // 2)
-        canvas_img.paste(resized, paste_pos, resized)
-        # Zielposition unten im 2. Slice
-        slice_w = width // slices
-        offset_x = int(lect_cfg.get("offset_x", 0) * scale)
-        offset_y = int(lect_cfg.get("offset_y", 0) * scale)
+    with stage("hyphenation"):
+        hyphen = module.hyphen
+        hyphenator = get_hyphenator(module.hyphen_lang) if module.hyphen_lang else None
+
+    # 2) Schriftarten als [Pfad, Größe]; ein nicht ladbarer Font bricht mit Pfad im Fehler ab
+    with stage("fonts"):
+        def font_key(key):
+            slot = texts[key].font
+            try:
+                get_font(slot.path, slot.size)
+            except OSError as e:
+                raise OSError(f"Schrift für '{key}' konnte nicht geladen werden: {slot.path} ({e})") from e
+            return slot.spec
+
+        fonts = {key: font_key(key) for key in texts}
+
+    items = []
+
+    # 3) Dozentenbild: Zielbox unten im 2. Slice
+    photo = module.photo
+    if photo:
+        target_w, target_h = photo.size
+        offset_x, offset_y = photo.offset
         base_x = slice_w + (slice_w - target_w)//2 + offset_x
         base_y = height - target_h + offset_y
-        full.paste(canvas_img, (int(base_x), int(base_y)), canvas_img)
-
-
-
-    # 5) Textboxen zeichnen
-    slice_w = width // slices
-    padding = int(50 * scale)
-    radius = int(config.get("box_radius", 20) * scale)
-    # Farben für Boxen
-    def get_box_color(key, fallback):
-        val = box_color_keys.get(key)
-        if val is not None:
-            return parse_color(val)
-        return fallback
-    # Defaults für Boxfarben
-    box_fill_default = tuple(palette.get("secondary", [255, 255, 255]))
-    box_outline = tuple(palette.get("text_dark", [0, 0, 0]))
-    slice1_fill = get_box_color("slice1", box_fill_default)
-    slice2_fill = get_box_color("slice2", box_fill_default)
-    slice3_fill = get_box_color("slice3", palette.get("highlight", box_fill_default))
+        items.append({
+            "type": "image",
+            "source": "lecturer",
+            "path": photo.path,
+            "size": [target_w, target_h],
+            "position": [int(base_x), int(base_y)],
+            "scale": scale,
+        })
+
+    # 4) Textboxen
+    padding = module.padding
+    radius = module.box_radius
+    outline_w = module.outline_width
+
+    # Optional: fonts.<key>.fit passt die Schriftgröße per binärer Suche an die Box an
+    def fit_font(key, spec, box_padding):
+        block = texts[key]
+        text = block.text
+        if not block.font.fit or not text or not text.strip() or spec is None:
+            return spec
+        font_path, size = spec
+        max_w = slice_w - 2 * box_padding
+        max_h = (block.font.max_height if block.font.max_height is not None else height) - 2 * box_padding
+        min_size = block.font.min_size
+
+        def layout(px):
+            lines = layout_lines(text, get_font(font_path, px), max_w, hyphenator, hyphen)
+            if text_height(lines, block.line_spacing) <= max_h and all(ln.bbox[2] <= max_w for ln in lines):
+                return lines
+            return None
+
+        px, _ = largest_fitting(list(range(size, min_size - 1, -1)), layout)
+        return [font_path, px if px is not None else min_size]
+
+    def text_box(key, fill, text_role, x0, x1, y_ref, **kwargs):
+        with stage(f"layout:text:{key}"):
+            block = texts[key]
+            spec = fit_font(key, fonts[key], block.padding)
+            box = layout_text_box(x0, x1, y_ref, block.text, scene_font(spec), block.padding, block.line_spacing,
+                                  hyphenator, hyphen, **kwargs)
+            if box is None:
+                return
+            rect, lines = box
+            if block.show_box:
+                items.append({"type": "box", "key": key, "rect": rect, "radius": radius, "fill": fill,
+                              "outline": "box:outline", "width": outline_w})
+            items.append({"type": "text", "key": key, "font": spec, "fill": text_role, "lines": lines})
 
     # 1. Slice: Titel
-    title = module_config.get("title") or module_config.get("id", "")
-    x0, x1 = 0, slice_w
     y0 = padding * 2
-    t_off_x, t_off_y = [int(t_off_x * scale), int(t_off_y * scale)]
-    draw_text_box(
-        draw, x0, x1, y0,
-        title, font_title,
-        slice1_fill, box_outline, radius,
-        title_pad, title_ls,
-        get_text_color("title"),
-        show_box=show_title_box,
-        hyphenator=hyphenator,
-        hyphen=hyphenation_config.get("hyphen", "-"),
-        align_y="top",
-        offset_x=t_off_x,
-        offset_y=t_off_y
-    )
+    t_off_x, t_off_y = texts["title"].offset
+    text_box("title", "box:slice1", "text:title", 0, slice_w, y0, align_y="top", offset_x=t_off_x, offset_y=t_off_y)
 
     # 1. Slice: Info
-    if module_config.get("slice1_info"):
-        info1 = module_config.get("slice1_info", "")
-        x0, x1 = 0, slice_w
+    if texts["slice1_info"].text:
         y_center = padding + (height/2 - padding) * 0.5
-        i1_off_x, i1_off_y = [int(i1_off_x * scale), int(i1_off_y * scale)]
-        draw_text_box(
-            draw, x0, x1, y_center,
-            info1, font_slice1,
-            slice1_fill, box_outline, radius,
-            info_pad, info_ls,
-            get_text_color("slice1_info"),
-            show_box=show_info1_box,
-            hyphenator=hyphenator,
-            hyphen=hyphenation_config.get("hyphen", "-"),
-            offset_x=i1_off_x,
-            offset_y=i1_off_y
-        )
+        i1_off_x, i1_off_y = texts["slice1_info"].offset
+        text_box("slice1_info", "box:slice1", "text:slice1_info", 0, slice_w, y_center,
+                 offset_x=i1_off_x, offset_y=i1_off_y)
 
     # Semester-Box
-    sem = module_config.get("semester", "")
-    margin_h, margin_v = sem_marg if isinstance(sem_marg, (list,tuple)) and len(sem_marg)==2 else (padding, padding)
-    margin_h = int(margin_h * scale)
-    margin_v = int(margin_v * scale)
-    sem_off_x, sem_off_y = [int(sem_off_x * scale), int(sem_off_y * scale)]
-    bbox_sem = draw.textbbox((0, 0), sem, font=font_semester)
-    sem_w = bbox_sem[2] - bbox_sem[0]
-    sem_h = bbox_sem[3] - bbox_sem[1]
-    box_w = sem_w + 2 * margin_h
-    box_h = sem_h + 2 * margin_v
-    box_x0 = int((slice_w - box_w) / 2)
-    box_y0 = int(height / 2 - box_h / 2)
-    box_x0 += sem_off_x
-    box_y0 += sem_off_y
-    box_x1 = box_x0 + box_w
-    box_y1 = box_y0 + box_h
-    if show_semester_box:
-        draw.rounded_rectangle(
-            [(box_x0, box_y0), (box_x1, box_y1)],
-            radius=radius,
-            fill=slice1_fill,
-            outline=box_outline,
-            width=4
-        )
-    text_x = box_x0 + margin_h
-    bbox_sem = draw.textbbox((0, 0), sem, font=font_semester)
-    text_y = box_y0 + margin_v - bbox_sem[1]
-    draw.text((text_x, text_y), sem, fill=get_text_color("semester"), font=font_semester)
+    with stage("layout:text:semester"):
+        sem = texts["semester"].text
+        margin_h, margin_v = module.semester_margin
+        sem_off_x, sem_off_y = texts["semester"].offset
+        from PIL import Image, ImageDraw
+        measure = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
+        bbox_sem = measure.textbbox((0, 0), sem, font=scene_font(fonts["semester"]))
+        sem_w = bbox_sem[2] - bbox_sem[0]
+        sem_h = bbox_sem[3] - bbox_sem[1]
+        box_w = sem_w + 2 * margin_h
+        box_h = sem_h + 2 * margin_v
+        box_x0 = int((slice_w - box_w) / 2)
+        box_y0 = int(height / 2 - box_h / 2)
+        box_x0 += sem_off_x
+        box_y0 += sem_off_y
+        box_x1 = box_x0 + box_w
+        box_y1 = box_y0 + box_h
+        if texts["semester"].show_box:
+            items.append({"type": "box", "key": "semester", "rect": [box_x0, box_y0, box_x1, box_y1], "radius": radius,
+                          "fill": "box:slice1", "outline": "box:outline", "width": outline_w})
+        text_x = box_x0 + margin_h
+        text_y = box_y0 + margin_v - bbox_sem[1]
+        items.append({"type": "text", "key": "semester", "font": fonts["semester"], "fill": "text:semester",
+                      "lines": [[sem, text_x, text_y]]})
 
     # 2. Slice: Dozentenname
-    x0, x1 = slice_w, slice_w * 2
-    lect_name = module_config.get("lecturer", {}).get("name", "")
-    lect_off_x, lect_off_y = [int(lect_off_x * scale), int(lect_off_y * scale)]
+    lect_off_x, lect_off_y = texts["lecturer"].offset
     y_center = height / 2 + lect_off_y
-    if lect_name:
-        draw_text_box(
-            draw, x0, x1, y_center,
-            lect_name, font_lecturer,
-            slice2_fill, box_outline, radius,
-            padding, info_ls,
-            get_text_color("slice2_info"),
-            show_box=show_lecturer_box,
-            hyphenator=hyphenator,
-            hyphen=hyphenation_config.get("hyphen", "-"),
-            offset_x=lect_off_x
-        )
+    if texts["lecturer"].text:
+        text_box("lecturer", "box:slice2", "text:slice2_info", slice_w, slice_w * 2, y_center, offset_x=lect_off_x)
 
     # 3. Slice: Modulinfo
-    if module_config.get("slice3_info"):
-        info3 = module_config.get("slice3_info", "")
-        x0, x1 = slice_w * 2, slice_w * 3
-        i3_off_x, i3_off_y = [int(i3_off_x * scale), int(i3_off_y * scale)]
-        y_center = height / 2 + box3_yoff
-        draw_text_box(
-            draw, x0, x1, y_center,
-            info3, font_slice3,
-            slice3_fill, box_outline, radius,
-            padding, info3_ls,
-            get_text_color("slice3_info"),
-            show_box=show_info3_box,
-            hyphenator=hyphenator,
-            hyphen=hyphenation_config.get("hyphen", "-"),
-            offset_x=i3_off_x,
-            offset_y=i3_off_y
-        )
+    if texts["slice3_info"].text:
+        i3_off_x, i3_off_y = texts["slice3_info"].offset
+        y_center = height / 2 + module.slice3_box_y_offset
+        text_box("slice3_info", "box:slice3", "text:slice3_info", slice_w * 2, slice_w * 3, y_center,
+                 offset_x=i3_off_x, offset_y=i3_off_y)
+
+    return {
+        "version": SCENE_VERSION,
+        "size": [width, height],
+        "scale": scale,
+        "slice_boxes": [[i * slice_w, 0, (i + 1) * slice_w, height] for i in range(canvas.slices)],
+        "items": items,
+    }
+
+def build_scene(module):
+    """
+    Szene eines kompilierten Moduls: gecachtes Layout (siehe scene.py) plus aufgelöste
+    Farben und Fingerprint-Config. Reine Farb-/Paletten- oder Formatänderungen
+    verwenden ein vorhandenes Layout weiter. Die Szene ist JSON-serialisierbar.
+    """
+    font_paths = [block.font.path for block in module.texts.values()]
+    key = layout_key(module.config, module.module_config, font_paths)
+    layout = load_layout(module.config, key)
+    if layout is None:
+        layout = layout_carousel(module)
+        store_layout(module.config, key, layout)
+
+    return {
+        "module_id": module.module_id,
+        "layout": layout,
+        "colors": {role: list(color) for role, color in module.colors.items()},
+        "fingerprint": module.fingerprint,
+    }
+
+# === Zeichnen ===
+
+def paint_background(full, draw, background, fingerprint_config, config, scale=1.0, size=None, origin=(0, 0)):
+    """
+    Füllt die Hintergrundfarbe und setzt optional das Fingerprint-Bild ein.
+    Maximalgröße und Offsets des Fingerprints beziehen sich auf 3240×1350 und werden mit scale skaliert.
+    Ist full nur ein Ausschnitt (Slice) des Canvas der Größe size, liegt seine linke obere Ecke
+    bei origin; alles wird entsprechend verschoben und am Rand abgeschnitten.
+    Fehler beim Laden des Fingerprints werden nicht abgefangen (die Config ist bereits geprüft).
+    """
+    width, height = size or full.size
+    ox, oy = origin
+    canvas_rect = [(-ox, -oy), (width - ox, height - oy)]
+    if not fingerprint_config:
+        with stage("background"):
+            # Fingerprint ist deaktiviert – trotzdem Hintergrundfarbe ausfüllen!
+            draw.rectangle(canvas_rect, fill=background)
+        return
+
+    # === Fingerprint-Bild als Hintergrundbild ===
+    fp_mode = fingerprint_config.get("background_mode", "inset")  # "inset" oder "centered"
+    def scaled(key, default):
+        value = fingerprint_config.get(key)
+        return default if value is None else int(value * scale)
+    # Zielgröße vorab bestimmen, damit der Fingerprint gleich passend verkleinert berechnet wird
+    if fp_mode == "centered":
+        fp_target = (width, height)
+    else:
+        fp_target = (scaled("fingerprint_max_width", width // 3),
+                     scaled("fingerprint_max_height", height // 2))
+    with stage("fingerprint"):
+        fp_img = load_fingerprint_image(config, fingerprint_config, fp_target)
+
+    with stage("background"):
+        if fp_mode == "centered":
+            from PIL import ImageOps
+            fp_resized = ImageOps.contain(fp_img, (width, height))
+            fp_w, fp_h = fp_resized.size
+            paste_x = (width - fp_w) // 2
+            paste_y = (height - fp_h) // 2
+            draw.rectangle(canvas_rect, fill=background)
+            fp_alpha = fp_resized.copy()
+            fp_alpha_val = fingerprint_config.get("background_alpha", 200)
+            fp_alpha.putalpha(fp_alpha_val)
+            full.paste(fp_alpha, (paste_x - ox, paste_y - oy), fp_alpha)
+
+        # Fingerprint-Bild unten links mit optionaler Skalierung einfügen ("inset", von compile_module geprüft)
+        else:
+            from PIL import ImageOps
+            draw.rectangle(canvas_rect, fill=background)
+            max_fp_width  = scaled("fingerprint_max_width", width // 3)
+            max_fp_height = scaled("fingerprint_max_height", height // 2)
+            fp_scaled = ImageOps.contain(fp_img, (max_fp_width, max_fp_height))
+            pos_x = scaled("fingerprint_offset_x", int(50 * scale))
+            pos_y = scaled("fingerprint_offset_y", height - fp_scaled.height - int(50 * scale))
+            full.paste(fp_scaled, (pos_x - ox, pos_y - oy), fp_scaled)
+
+def photo_resample(config):
+    """Resampling für das Dozentenbild: in der Vorschau schneller (BILINEAR)."""
+    from PIL import Image
+
+    return Image.BILINEAR if is_preview(config) else Image.LANCZOS
+
+def paint_scene(scene, config, region=None):
+    """
+    Zeichenschritt: setzt eine Szene (siehe build_scene) in ein RGBA-Bild um.
+    config wird nur noch für die Bild-Caches (Grundebene, Fingerprint, Dozentenbild) gebraucht.
+    Mit region=(x0, y0, x1, y1) wird nur dieser Ausschnitt in einen eigenen Puffer gezeichnet;
+    Hintergrund, Boxen und Text, die über den Rand reichen, werden abgeschnitten.
+    """
+    from PIL import Image, ImageDraw
+
+    layout = scene["layout"]
+    colors = {role: tuple(color) for role, color in scene["colors"].items()}
+    width, height = layout["size"]
+    rx0, ry0, rx1, ry1 = region or (0, 0, width, height)
+
+    def build_base():
+        base = Image.new("RGBA", (rx1 - rx0, ry1 - ry0), (0, 0, 0, 0))
+        paint_background(base, ImageDraw.Draw(base), colors["background"], scene.get("fingerprint"), config,
+                         layout["scale"], (width, height), (rx0, ry0))
+        return base
+
+    if region is None:
+        # Grundebene (Hintergrund + Fingerprint) ist für Module mit gleichem Look identisch, siehe background_cache.py
+        full = load_background_layer(config, (width, height), colors["background"], scene.get("fingerprint"), layout["scale"], build_base)
+    else:
+        # Ausschnitte werden nicht gecacht, damit nur der aktuelle Slice Speicher belegt
+        full = build_base()
+    draw = ImageDraw.Draw(full)
+
+    def outside(x0, y0, x1, y1):
+        return x1 <= rx0 or x0 >= rx1 or y1 <= ry0 or y0 >= ry1
+
+    for item in layout["items"]:
+        kind = item["type"]
+        if kind == "image":
+            with stage("lecturer_photo"):
+                if not os.path.exists(item["path"]):
+                    continue
+                target_w, target_h = item["size"]
+                px, py = item["position"]
+                if outside(px, py, px + target_w, py + target_h):
+                    continue
+                # Skaliert und gecacht, siehe photos.py
+                canvas_img = load_lecturer_image(config, item["path"], target_w, target_h, item["scale"], photo_resample(config))
+                full.paste(canvas_img, (px - rx0, py - ry0), canvas_img)
+        elif kind == "box":
+            with stage(f"text:{item['key']}"):
+                x0, y0, x1, y1 = item["rect"]
+                if outside(x0, y0, x1 + 1, y1 + 1):
+                    continue
+                draw.rounded_rectangle(
+                    [(x0 - rx0, y0 - ry0), (x1 - rx0, y1 - ry0)],
+                    radius=item["radius"],
+                    fill=colors[item["fill"]],
+                    outline=colors[item["outline"]],
+                    width=item["width"]
+                )
+        elif kind == "text":
+            with stage(f"text:{item['key']}"):
+                font = scene_font(item["font"])
+                fill = colors[item["fill"]]
+                for line, tx, ty in item["lines"]:
+                    # FreeType rastert immer die ganze Zeile; Zeilen außerhalb des Ausschnitts auslassen
+                    if region is not None:
+                        left, top, right, bottom = font.getbbox(line)
+                        if outside(tx + left, ty + top, tx + right, ty + bottom):
+                            continue
+                    draw.text((tx - rx0, ty - ry0), line, fill=fill, font=font)
+    return full
+
+# === Hauptfunktion ===
+
+def create_socialmedia_carousel(config):
+    # Config prüfen und auflösen (ConfigError vor jeder Pixelarbeit); kompilierte Module direkt verwenden
+    module = compile_module(config)
+    # 0) Render-Cache: unveränderte Module (Config + Asset-Inhalte) nicht neu zeichnen
+    cached, cache_key = lookup_carousel(module)
+    if cached is not None:
+        return cached
+    # Slice-Streaming: jeder Slice wird einzeln gezeichnet und gespeichert
+    if is_streaming(module):
+        return stream_carousel(module, build_scene(module), cache_key)
+    # 1) Layout (gecacht), 2) Zeichnen und 3) Bilder speichern
+    scene, full, profiles = paint_carousel(module)
+    return write_carousel(module, scene, full, profiles, cache_key)
+
+def is_streaming(module):
+    """True, wenn output.stream_slices gesetzt ist (Slices einzeln zeichnen, kein Gesamtbild)."""
+    return bool(module.output.get("stream_slices", False))
+
+def lookup_carousel(module):
+    """
+    Schritt 0 von create_socialmedia_carousel: prüft den Render-Cache.
+    Gibt (Ergebnis, None) bei einem Treffer zurück, sonst (None, Cache-Schlüssel oder None);
+    im zweiten Fall ist der alte Stempel bereits entfernt.
+    """
+    output_dir = module.output_path
+
+    cache_key = None
+    if render_cache.is_enabled(module.config):
+        cache_key = render_cache.render_key(module.config, module.asset_paths)
+        if render_cache.lookup(output_dir, cache_key):
+            print(f"♻️  Cache-Treffer für {module.module_id}: Ausgabe in {output_dir} ist aktuell")
+            return {"module_id": module.module_id, "output_path": output_dir, "cached": True}, None
+    # Alten Stempel entfernen, bevor die Dateien überschrieben werden
+    render_cache.invalidate(output_dir)
+    return None, cache_key
+
+def paint_carousel(module, scene=None):
+    """
+    Schritte 1–2: Szene bauen (falls nicht übergeben) und zeichnen, samt zusätzlicher
+    Ausgabegrößen. Gibt (Szene, Gesamtbild, [(Profil, Bild, Slice-Boxen), ...]) zurück.
+    """
+    if scene is None:
+        scene = build_scene(module)
+    full = paint_scene(scene, module.config)
+    slice_boxes = [tuple(box) for box in scene["layout"]["slice_boxes"]]
+    return scene, full, render_profiles(module, full, slice_boxes)
 
-    # Optional: Fingerprint-Bild einfügen, falls konfiguriert (entfernt: alte Methode)
+def write_carousel(module, scene, full, profiles, cache_key=None):
+    """Schritt 3: kodiert und speichert Gesamtbild, Slices und Profile; setzt den Render-Cache-Stempel."""
+    output_dir = module.output_path
 
-    # 6) Bilder speichern
-    output_dir = config.get("output_path", "output")
     os.makedirs(output_dir, exist_ok=True)
-    full.convert("RGB").save(os.path.join(output_dir, "post.png"))
-    print(f"✅ Full image saved: {os.path.join(output_dir, 'post.png')}")
-
-    for i in range(slices):
-        box = (i * slice_w, 0, (i + 1) * slice_w, height)
-        part = full.crop(box).convert("RGB")
-        out_p = os.path.join(output_dir, f"post_{i+1}.png")
-        part.save(out_p)
-        print(f"✅ Slice {i+1} gespeichert: {out_p}")
\ No newline at end of file
+    slice_boxes = [tuple(box) for box in scene["layout"]["slice_boxes"]]
+    settings = module.output
+    with stage("encode"):
+        written = save_carousel(full, slice_boxes, output_dir, settings)
+    # Weitere Ausgabegrößen in Unterordnern <output_path>/<Profilname>
+    for profile, image, boxes in profiles:
+        profile_dir = os.path.join(output_dir, profile["name"])
+        os.makedirs(profile_dir, exist_ok=True)
+        with stage("encode"):
+            written += save_carousel(image, boxes, profile_dir, {**settings, **profile["output"]})
+    return finish_carousel(module, scene, written, cache_key)
+
+def stream_carousel(module, scene, cache_key=None):
+    """
+    Schritte 2–3 im Streaming-Modus (output.stream_slices): jeder Slice wird in einen
+    Puffer in Slice-Größe gezeichnet, kodiert und freigegeben, bevor der nächste beginnt.
+    Der Spitzenspeicher hängt so von einem Slice ab statt vom ganzen Panorama.
+    Ein Gesamtbild wird nicht geschrieben; zusätzliche Ausgabegrößen (außer in der
+    Vorschau) werden mit eigenem Layout ebenfalls Slice für Slice gezeichnet.
+    """
+    output_dir = module.output_path
+    os.makedirs(output_dir, exist_ok=True)
+    settings = module.output
+
+    def stream(scene, output_dir, settings):
+        slice_boxes = [tuple(box) for box in scene["layout"]["slice_boxes"]]
+        return save_slices(lambda box: paint_scene(scene, module.config, box), slice_boxes, output_dir, settings)
+
+    written = stream(scene, output_dir, settings)
+    if not module.preview:
+        for profile in module.profiles:
+            profile_dir = os.path.join(output_dir, profile["name"])
+            os.makedirs(profile_dir, exist_ok=True)
+            profile_scene = build_scene(compile_module({**module.config, "output_size": list(profile["size"])}))
+            written += stream(profile_scene, profile_dir, {**settings, **profile["output"]})
+    return finish_carousel(module, scene, written, cache_key)
+
+def finish_carousel(module, scene, written, cache_key=None):
+    """Legt optional scene.json ab, setzt den Render-Cache-Stempel und gibt das Ergebnis zurück."""
+    output_dir = module.output_path
+    # Optional: Szene neben die Bilder legen (zum Vergleichen zweier Läufe)
+    if module.output.get("write_scene", False):
+        scene_path = os.path.join(output_dir, "scene.json")
+        write_json(scene_path, scene)
+        written.append(scene_path)
+
+    if cache_key is not None:
+        render_cache.store(output_dir, cache_key, written)
+    return {"module_id": module.module_id, "output_path": output_dir, "cached": False}
+
+def prefetch_images(scene, module):
+    """
+    Lädt die Dozentenbilder einer Szene vorab in den Bild-Cache (Dekodieren und Skalieren),
+    damit paint_scene sie nur noch einfügt. Fingerprints bleiben bewusst beim Zeichnen:
+    die Pillow-Masken-Engine nutzt das globale random-Modul und darf nur in einem Thread laufen.
+    """
+    for item in scene["layout"]["items"]:
+        if item["type"] == "image" and os.path.exists(item["path"]):
+            target_w, target_h = item["size"]
+            load_lecturer_image(module.config, item["path"], target_w, target_h, item["scale"], photo_resample(module.config))
+
+def render_profiles(module, full, slice_boxes):
+    """
+    Bilder der zusätzlichen Ausgabegrößen (siehe profiles.py) als [(Profil, Bild, Slice-Boxen), ...].
+    Gezeichnet wird nur die Hauptgröße; kleinere Profile mit gleichem Seitenverhältnis entstehen
+    per Resample-Pyramide daraus. Native, größere oder anders proportionierte Profile werden
+    mit eigenem Layout neu gezeichnet (Text bleibt dort pixelgenau gesetzt).
+    In der Vorschau werden keine Profile erzeugt.
+    """
+    if module.preview or not module.profiles:
+        return []
+    profiles = module.profiles
+    with stage("resample"):
+        pyramid = resample_pyramid(full, slice_boxes, [p for p in profiles if can_derive(p, full.size)])
+    results = []
+    for profile in profiles:
+        if profile["name"] in pyramid:
+            image, boxes = pyramid[profile["name"]]
+        else:
+            image, boxes = render_carousel_image({**module.config, "output_size": list(profile["size"])})
+        results.append((profile, image, boxes))
+    return results
+
+def render_carousel_image(config):
+    """Rendert ein Modul (Config oder kompiliertes Modul) im Speicher und gibt (Gesamtbild, Slice-Boxen) zurück."""
+    module = compile_module(config)
+    scene = build_scene(module)
+    full = paint_scene(scene, module.config)
+    return full, [tuple(box) for box in scene["layout"]["slice_boxes"]]
+
+def render_carousel_bytes(config):
+    """
+    Rendert ein Modul vollständig im Speicher (ohne Ausgabeordner und Render-Cache)
+    und gibt [(Dateiname, Bytes), ...] in derselben Reihenfolge wie save_carousel zurück.
+    """
+    module = compile_module(config)
+    full, slice_boxes = render_carousel_image(module)
+    settings = module.output
+    with stage("encode"):
+        files = encode_carousel(full, slice_boxes, settings)
+    # Zusätzliche Ausgabegrößen als "<Profilname>/<Datei>"
+    for profile, image, boxes in render_profiles(module, full, slice_boxes):
+        with stage("encode"):
+            encoded = encode_carousel(image, boxes, {**settings, **profile["output"]})
+        files += [(f"{profile['name']}/{name}", data) for name, data in encoded]
+    return files
@@ -0,0 +1,81 @@
+import threading
+
+# Silbentrenner pro Sprache; pyphen wird erst beim ersten Bedarf importiert
+_hyphenators = {}
+_lock = threading.Lock()
+
+
+class Hyphenator:
+    """
+    Silbentrenner einer Sprache mit Cache der Trennstellen je Wort.
+    Dieselben langen Komposita kommen in vielen Modulen vor; pyphen rechnet jedes nur einmal.
+    Bietet wie pyphen.Pyphen positions(word), kann also überall stattdessen übergeben werden.
+    """
+
+    def __init__(self, lang):
+        import pyphen
+
+        self.lang = lang
+        self._pyphen = pyphen.Pyphen(lang=lang)
+        self._positions = {}
+
+    def positions(self, word):
+        """Trennstellen von word als Tupel von Zeichenindizes, gecacht."""
+        positions = self._positions.get(word)
+        if positions is None:
+            positions = tuple(int(pos) for pos in self._pyphen.positions(word))
+            self._positions[word] = positions
+        return positions
+
+    def clear(self):
+        self._positions.clear()
+
+
+def is_supported_language(lang):
+    """True, wenn pyphen für lang (auch über die Rückfallsprache, z. B. "de-DE") ein Wörterbuch hat."""
+    import pyphen
+
+    return pyphen.language_fallback(lang) is not None
+
+
+def get_hyphenator(lang):
+    """Geteilter Hyphenator für lang (Wörterbuch und Trennstellen bleiben im Prozess erhalten)."""
+    hyphenator = _hyphenators.get(lang)
+    if hyphenator is None:
+        with _lock:
+            hyphenator = _hyphenators.get(lang)
+            if hyphenator is None:
+                hyphenator = _hyphenators[lang] = Hyphenator(lang)
+    return hyphenator
+
+
+def clear_hyphenation_cache():
+    """Vergisst alle gecachten Trennstellen (die Wörterbücher bleiben geladen)."""
+    for hyphenator in list(_hyphenators.values()):
+        hyphenator.clear()
+
+
+def split_word(word, positions, width, max_width, hyphen="-"):
+    """
+    Zerlegt word an den Silbengrenzen positions in Stücke, die samt Trennzeichen
+    in max_width passen; sehr lange Wörter werden dabei auch mehrfach getrennt.
+    Jedes Stück endet an der letzten passenden Grenze. Passt an keiner Grenze mehr
+    etwas, bleibt der Rest ungeteilt (und ist dann breiter als max_width).
+    width(text) misst die Breite eines Textstücks.
+    """
+    pieces = []
+    start = 0
+    while width(word[start:]) > max_width:
+        split_pos = None
+        for pos in reversed(positions):
+            if pos <= start:
+                break
+            if width(word[start:pos] + hyphen) <= max_width:
+                split_pos = pos
+                break
+        if split_pos is None:
+            break
+        pieces.append(word[start:split_pos] + hyphen)
+        start = split_pos
+    pieces.append(word[start:])
+    return pieces
@@ -0,0 +1,163 @@
+import contextlib
+import os
+import time
+from contextlib import contextmanager
+
+# Aktiver Recorder oder None; ohne Recorder ist stage() ein geteilter No-op-Kontext
+_recorder = None
+_NULL_STAGE = contextlib.nullcontext()
+
+MB = 1024 * 1024
+
+
+def peak_rss_mb():
+    """
+    Höchststand des Arbeitsspeichers (RSS) seit Prozessstart in MB, None ohne resource-Modul.
+    Wächst nur und taugt deshalb nicht für einzelne Stufen, dafür current_rss_mb.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux meldet KB, macOS Bytes
+    return peak / MB if os.uname().sysname == "Darwin" else peak / 1024
+
+
+def current_rss_mb():
+    """Aktueller Arbeitsspeicher (RSS) dieses Prozesses in MB aus /proc/self/statm, None ohne procfs."""
+    try:
+        with open("/proc/self/statm") as f:
+            resident = int(f.read().split()[1])
+        return resident * os.sysconf("SC_PAGE_SIZE") / MB
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class StageRecorder:
+    """
+    Sammelt je benannter Render-Stufe Wall-Clock- und CPU-Zeit,
+    die RSS-Änderung zwischen Stufenbeginn und -ende und – falls tracemalloc läuft –
+    die Spitze der Python-Allokationen innerhalb der Stufe.
+    """
+
+    def __init__(self):
+        self.timings = {}
+        self.cpu = {}
+        self.rss_delta = {}
+        self.alloc_peak = {}
+
+    @contextmanager
+    def stage(self, name):
+        import tracemalloc
+
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+        rss_start = current_rss_mb()
+        start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self.timings.setdefault(name, []).append(time.perf_counter() - start)
+            self.cpu.setdefault(name, []).append(time.process_time() - cpu_start)
+            rss = current_rss_mb()
+            if rss is not None and rss_start is not None:
+                delta = rss - rss_start
+                self.rss_delta[name] = max(self.rss_delta.get(name, delta), delta)
+            if tracing:
+                alloc = tracemalloc.get_traced_memory()[1] / MB
+                self.alloc_peak[name] = max(self.alloc_peak.get(name, 0.0), alloc)
+
+    def totals(self):
+        return {name: sum(values) for name, values in self.timings.items()}
+
+    def report(self):
+        """Stufenwerte als JSON-taugliches Dict (Zeiten summiert, Speicher als Maximum über die Aufrufe)."""
+        stages = {}
+        for name, values in self.timings.items():
+            entry = {
+                "calls": len(values),
+                "wall_s": round(sum(values), 6),
+                "cpu_s": round(sum(self.cpu.get(name, ())), 6),
+            }
+            if name in self.rss_delta:
+                entry["rss_delta_mb"] = round(self.rss_delta[name], 1)
+            if name in self.alloc_peak:
+                entry["alloc_peak_mb"] = round(self.alloc_peak[name], 1)
+            stages[name] = entry
+        return stages
+
+
+def stage(name):
+    """Misst eine Render-Stufe, falls gerade aufgezeichnet wird (sonst kostenlos)."""
+    recorder = _recorder
+    if recorder is None:
+        return _NULL_STAGE
+    return recorder.stage(name)
+
+
+@contextmanager
+def recording(recorder=None):
+    """Aktiviert einen Recorder für den umschlossenen Block und gibt ihn zurück."""
+    global _recorder
+    previous = _recorder
+    _recorder = recorder or StageRecorder()
+    try:
+        yield _recorder
+    finally:
+        _recorder = previous
+
+
+def measure(func, trace_memory=False, profile_path=None):
+    """
+    Führt func() mit aktivem Recorder aus und liefert (Ergebnis, Metriken).
+    Die Metriken enthalten Wall-/CPU-Zeit, RSS-Änderung und Allokations-Spitze des ganzen
+    Aufrufs, den RSS-Höchststand des Prozesses sowie die Werte je Stufe. Mit profile_path wird zusätzlich ein
+    cProfile-Dump geschrieben (auswertbar mit python -m pstats).
+    """
+    import tracemalloc
+
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    profiler = None
+    if profile_path:
+        import cProfile
+        profiler = cProfile.Profile()
+
+    recorder = StageRecorder()
+    rss_start = current_rss_mb()
+    start, cpu_start = time.perf_counter(), time.process_time()
+    try:
+        with recording(recorder):
+            if profiler:
+                profiler.enable()
+            try:
+                result = func()
+            finally:
+                if profiler:
+                    profiler.disable()
+        wall, cpu = time.perf_counter() - start, time.process_time() - cpu_start
+
+        metrics = {"wall_s": round(wall, 6), "cpu_s": round(cpu, 6)}
+        rss = current_rss_mb()
+        if rss is not None and rss_start is not None:
+            metrics["rss_delta_mb"] = round(rss - rss_start, 1)
+        hwm = peak_rss_mb()
+        if hwm is not None:
+            # Seit Prozessstart, bei mehreren Modulen im selben Prozess also kumulativ
+            metrics["process_rss_hwm_mb"] = round(hwm, 1)
+        if tracemalloc.is_tracing():
+            # reset_peak() in den Stufen verkürzt die Gesamtspitze, daher Maximum über alles
+            alloc = max([tracemalloc.get_traced_memory()[1] / MB, *recorder.alloc_peak.values()])
+            metrics["alloc_peak_mb"] = round(alloc, 1)
+        metrics["stages"] = recorder.report()
+        if profiler:
+            os.makedirs(os.path.dirname(profile_path) or ".", exist_ok=True)
+            profiler.dump_stats(profile_path)
+            metrics["profile"] = profile_path
+        return result, metrics
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
@@ -0,0 +1,536 @@
+import os
+import json
+
+from .hyphenation import is_supported_language
+from .output import output_settings, save_options
+from .preview import is_preview
+from .profiles import output_profiles
+
+# Globale Farbpalette (wird erst beim ersten Zugriff gelesen)
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+palette_path = os.path.join(base_dir, "assets", "color_palettes", "palette.json")
+_palette = None
+
+# Basis-Asset-Pfade korrekt auflösen
+fonts_dir = os.path.join(base_dir, "assets", "fonts")
+prof_pictures_dir = os.path.join(base_dir, "assets", "prof_pictures")
+backgrounds_dir = os.path.join(base_dir, "assets", "backgrounds_fingerprint")
+
+# Referenzgröße des Layouts; alle Pixelangaben der Configs beziehen sich darauf
+BASE_SIZE = (3240, 1350)
+
+# Standard-Schriften je Text-Slot: (Pfad, Größe); flache Overrides heißen "<slot>_font_path"/"<slot>_font_size"
+FONT_DEFAULTS = {
+    "title":       ("assets/fonts/Roboto-Bold.ttf",    80),
+    "slice1_info": ("assets/fonts/Roboto-Regular.ttf", 48),
+    "semester":    ("assets/fonts/Roboto-Bold.ttf",    60),
+    "lecturer":    ("assets/fonts/Roboto-Regular.ttf", 48),
+    "slice3_info": ("assets/fonts/Roboto-Regular.ttf", 48),
+}
+
+# Kanten, an denen die Fingerprint-Maske Zonen bilden kann (Standard: alle)
+DEFAULT_SIDES = ["top", "right", "bottom", "left"]
+
+# Kleinste Schriftgröße, auf die fonts.<slot>.fit verkleinert (Standard für fonts.<slot>.min_size)
+FIT_MIN_SIZE = 10
+
+
+def get_palette():
+    """Farbpalette aus palette.json; beim ersten Aufruf geladen, danach geteilt."""
+    if _palette is None:
+        return reload_palette()
+    return _palette
+
+
+def reload_palette():
+    """Liest palette.json neu ein (z. B. im Watch-Modus)."""
+    global _palette
+    with open(palette_path, encoding="utf-8") as f:
+        _palette = json.load(f)
+    return _palette
+
+
+def resolve_font_path(font_path):
+    """Relative Font-Pfade werden immer im Projektordner assets/fonts gesucht."""
+    if not os.path.isabs(font_path):
+        font_path = os.path.join(fonts_dir, os.path.basename(font_path))
+    return font_path
+
+
+def resolve_photo_path(photo_path):
+    """Relative Dozentenbilder werden immer im Projektordner assets/prof_pictures gesucht."""
+    if photo_path and not os.path.isabs(photo_path):
+        photo_path = os.path.join(prof_pictures_dir, os.path.basename(photo_path))
+    return photo_path
+
+
+def resolve_background_path(image_path):
+    """Relative Fingerprint-Eingabebilder werden immer im Projektordner assets/backgrounds_fingerprint gesucht."""
+    if image_path and not os.path.isabs(image_path):
+        image_path = os.path.join(backgrounds_dir, os.path.basename(image_path))
+    return image_path
+
+
+def parse_color(val):
+    """
+    Wandelt eine Farbangabe in ein RGB-Tupel um.
+    - val: entweder hex "#RRGGBB", ein Palette-Schlüssel oder ein RGB-Tupel/Liste
+    """
+    palette = get_palette()
+    if not val:
+        # Default schwarz, falls kein Wert
+        return tuple(palette.get("black", [0,0,0]))
+    if isinstance(val, str):
+        if val.startswith("#"):
+            from PIL import ImageColor
+            return ImageColor.getrgb(val)
+        return tuple(palette.get(val, [255, 255, 255]))
+    # Annahme: Liste/Tupel
+    return tuple(val)
+
+
+def extract_module_config(config):
+    """Modul-Konfiguration aus der zusammengeführten Config (auch doppelt geschachtelt)."""
+    if 'modules' in config and isinstance(config['modules'], list) and config['modules']:
+        module_config = config['modules'][0]
+    else:
+        module_config = config
+    # Falls Module selbst nochmals in module_config geschachtelt sind, entpacken
+    if isinstance(module_config, dict) and 'modules' in module_config and isinstance(module_config['modules'], list) and module_config['modules']:
+        module_config = module_config['modules'][0]
+    return module_config
+
+
+class ConfigError(ValueError):
+    """Ungültige Modul-Config; problems enthält alle gefundenen Fehler, nicht nur den ersten."""
+
+    def __init__(self, module_id, problems):
+        self.module_id = module_id
+        self.problems = list(problems)
+        super().__init__(f"Modul '{module_id}' ungültig: " + "; ".join(self.problems))
+
+
+class Canvas:
+    """Ausgabegröße, Skalierung gegenüber BASE_SIZE und Slice-Aufteilung."""
+
+    __slots__ = ("width", "height", "scale", "slices", "slice_w")
+
+    def __init__(self, width, height, slices):
+        self.width = width
+        self.height = height
+        self.scale = min(width / BASE_SIZE[0], height / BASE_SIZE[1])
+        self.slices = slices
+        self.slice_w = width // slices
+
+
+class FontSlot:
+    """Schrift eines Text-Slots: absoluter Pfad, skalierte Größe und Einstellungen für fonts.<slot>.fit."""
+
+    __slots__ = ("path", "size", "fit", "min_size", "max_height")
+
+    def __init__(self, path, size, fit=False, min_size=FIT_MIN_SIZE, max_height=None):
+        self.path = path
+        self.size = size
+        self.fit = fit
+        self.min_size = min_size
+        self.max_height = max_height
+
+    @property
+    def spec(self):
+        """[Pfad, Größe] wie in der Szene."""
+        return [self.path, self.size]
+
+
+class TextBlock:
+    """Ein Textfeld des Layouts; Versatz, Abstände und Innenabstand sind bereits skaliert."""
+
+    __slots__ = ("text", "font", "offset", "line_spacing", "padding", "show_box")
+
+    def __init__(self, text, font, offset=(0, 0), line_spacing=0, padding=0, show_box=False):
+        self.text = text
+        self.font = font
+        self.offset = offset
+        self.line_spacing = line_spacing
+        self.padding = padding
+        self.show_box = show_box
+
+
+class Photo:
+    """Dozentenbild: absoluter Pfad, skalierte Zielgröße und skalierter Versatz."""
+
+    __slots__ = ("path", "size", "offset")
+
+    def __init__(self, path, size, offset):
+        self.path = path
+        self.size = size
+        self.offset = offset
+
+
+class CompiledModule:
+    """
+    Geprüfte, aufgelöste Config eines Moduls, wie sie Layout und Zeichnen brauchen:
+    absolute Asset-Pfade, Farben als RGB-Tupel und auf die Ausgabegröße skalierte Maße.
+    config und module_config bleiben als Rohdaten erhalten, nur noch für Cache-Schlüssel
+    und Cache-Einstellungen. Entsteht über compile_module.
+    """
+
+    __slots__ = (
+        "config", "module_config", "module_id", "output_path", "preview", "output", "profiles",
+        "canvas", "hyphen_lang", "hyphen", "texts", "semester_margin", "slice3_box_y_offset",
+        "photo", "padding", "box_radius", "outline_width", "colors", "fingerprint", "asset_paths",
+    )
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            setattr(self, name, values[name])
+
+
+def _section(source, key, path, problems):
+    """Unterabschnitt source[key] als Dict (fehlend = leer)."""
+    value = source.get(key)
+    if value is None:
+        return {}
+    if not isinstance(value, dict):
+        problems.append(f"{path} muss ein Objekt sein")
+        return {}
+    return value
+
+
+def _number(value, path, problems, default, minimum=None, integer=False):
+    """value als Zahl (optional ganzzahlig und mit Untergrenze); sonst Fehler und default."""
+    if isinstance(value, bool) or not isinstance(value, int if integer else (int, float)):
+        problems.append(f"{path} muss eine {'ganze ' if integer else ''}Zahl sein, nicht {value!r}")
+        return default
+    if minimum is not None and value < minimum:
+        problems.append(f"{path} muss mindestens {minimum} sein, nicht {value!r}")
+        return default
+    return value
+
+
+def _pair(value, path, problems, default=(0, 0)):
+    """[x, y] aus zwei Zahlen; sonst Fehler und default."""
+    if not (isinstance(value, (list, tuple)) and len(value) == 2):
+        problems.append(f"{path} muss ein Paar [x, y] sein, nicht {value!r}")
+        return default
+    x = _number(value[0], path, problems, None)
+    y = _number(value[1], path, problems, None)
+    return default if x is None or y is None else (x, y)
+
+
+def _flag(value, path, problems, default):
+    if not isinstance(value, bool):
+        problems.append(f"{path} muss true oder false sein, nicht {value!r}")
+        return default
+    return value
+
+
+def _text(value, path, problems):
+    if not isinstance(value, str):
+        problems.append(f"{path} muss ein Text sein, nicht {value!r}")
+        return ""
+    return value
+
+
+def _color(value, path, problems):
+    """Wie parse_color, aber unbekannte Palettennamen und ungültige Werte sind Fehler statt Weiß."""
+    if value and isinstance(value, str) and not value.startswith("#") and value not in get_palette():
+        problems.append(f"{path}: unbekannte Palettenfarbe '{value}'")
+        return (255, 255, 255)
+    if value and not isinstance(value, str):
+        if not (isinstance(value, (list, tuple)) and len(value) in (3, 4)
+                and all(isinstance(c, int) and not isinstance(c, bool) and 0 <= c <= 255 for c in value)):
+            problems.append(f"{path} muss ein Palettenname, \"#RRGGBB\" oder [R, G, B] sein, nicht {value!r}")
+            return (255, 255, 255)
+    try:
+        return parse_color(value)
+    except ValueError:
+        problems.append(f"{path}: ungültige Farbe {value!r}")
+        return (255, 255, 255)
+
+
+# Prozessweites Ergebnis der Inhaltsprüfung je (Pfad, mtime, Größe, Art), z. B. für den Watch-Modus
+_asset_errors = {}
+
+
+def _asset_error(path, kind):
+    """Fehlermeldung, falls die Datei kein lesbares Bild (nur Header) bzw. keine Schrift ist, sonst None."""
+    st = os.stat(path)
+    key = (path, st.st_mtime_ns, st.st_size, kind)
+    if key not in _asset_errors:
+        from PIL import Image, ImageFont
+
+        try:
+            if kind == "image":
+                with Image.open(path):
+                    pass
+            else:
+                ImageFont.truetype(path, 10)
+            _asset_errors[key] = None
+        except OSError as e:
+            _asset_errors[key] = str(e)
+    return _asset_errors[key]
+
+
+def _asset(path, label, problems, kind=None):
+    """
+    Meldet fehlende Asset-Dateien, bevor gerendert wird.
+    kind="image" öffnet den Bild-Header (ohne zu dekodieren), kind="font" lädt die Schrift.
+    """
+    if not os.path.isfile(path):
+        problems.append(f"{label} nicht gefunden: {path}")
+        return
+    if kind:
+        error = _asset_error(path, kind)
+        if error:
+            what = "kein lesbares Bild" if kind == "image" else "keine lesbare Schrift"
+            problems.append(f"{label} ist {what}: {path} ({error})")
+
+
+def _compile_colors(config, module_config, problems):
+    """Löst alle Farbrollen des Layouts über Modul-Config und Palette auf."""
+    # Hintergrundfarbe ermitteln: bevorzugt aus Modul-Config, sonst aus Hauptconfig
+    mod_bg_cfg = module_config.get("background", {})
+    if isinstance(mod_bg_cfg, dict) and mod_bg_cfg.get("type") == "palette":
+        bg_color_key, bg_path = mod_bg_cfg.get("value"), "background.value"
+    else:
+        bg_color_key, bg_path = _section(config, "background", "background", problems).get("value"), "background.value (config.json)"
+    palette_overrides = _section(module_config, "palette_overrides", "palette_overrides", problems)
+    box_color_keys = palette_overrides.get("boxes", _section(module_config, "box_colors", "box_colors", problems))
+    text_color_keys = palette_overrides.get("text", _section(module_config, "text_colors", "text_colors", problems))
+    if not isinstance(box_color_keys, dict) or not isinstance(text_color_keys, dict):
+        problems.append("palette_overrides.boxes/text müssen Objekte sein")
+        box_color_keys, text_color_keys = {}, {}
+    # Standard-Textfarbe aus Palette
+    palette = get_palette()
+    default_text_color = tuple(palette.get("black", [0,0,0]))
+    def get_text_color(key):
+        color_key = text_color_keys.get(key)
+        if not color_key:
+            return default_text_color
+        return _color(color_key, f"text_colors.{key}", problems)
+    # Farben für Boxen
+    def get_box_color(key, fallback):
+        val = box_color_keys.get(key)
+        if val is not None:
+            return _color(val, f"box_colors.{key}", problems)
+        return fallback
+    # Defaults für Boxfarben
+    box_fill_default = tuple(palette.get("secondary", [255, 255, 255]))
+    colors = {
+        "background":  _color(bg_color_key, bg_path, problems),
+        "box:outline": tuple(palette.get("text_dark", [0, 0, 0])),
+        "box:slice1":  get_box_color("slice1", box_fill_default),
+        "box:slice2":  get_box_color("slice2", box_fill_default),
+        "box:slice3":  get_box_color("slice3", tuple(palette.get("highlight", box_fill_default))),
+    }
+    for key in ("title", "slice1_info", "semester", "slice2_info", "slice3_info"):
+        colors[f"text:{key}"] = get_text_color(key)
+    return colors
+
+
+def _compile_fingerprint(module_config, problems):
+    """Fingerprint-Config mit absolutem Eingabebild oder None, wenn abgeschaltet."""
+    fingerprint_config = _section(module_config, "fingerprint", "fingerprint", problems)
+    if not fingerprint_config.get("enabled", False):
+        return None
+    input_image = fingerprint_config.get("input_image")
+    if not input_image or not isinstance(input_image, str):
+        problems.append("fingerprint.input_image fehlt")
+    else:
+        input_image = resolve_background_path(input_image)
+        _asset(input_image, "fingerprint.input_image", problems, "image")
+    mode = fingerprint_config.get("background_mode", "inset")
+    if mode not in ("inset", "centered"):
+        problems.append(f"fingerprint.background_mode muss \"inset\" oder \"centered\" sein, nicht {mode!r}")
+    if fingerprint_config.get("random_seed") is not None:
+        _number(fingerprint_config["random_seed"], "fingerprint.random_seed", problems, None, integer=True)
+    _number(fingerprint_config.get("base_size"), "fingerprint.base_size", problems, None, minimum=1, integer=True)
+    if fingerprint_config.get("zone_count") is not None:
+        _number(fingerprint_config["zone_count"], "fingerprint.zone_count", problems, None, minimum=0, integer=True)
+    if fingerprint_config.get("background_alpha") is not None:
+        _number(fingerprint_config["background_alpha"], "fingerprint.background_alpha", problems, None,
+                minimum=0, integer=True)
+    for key in ("fingerprint_max_width", "fingerprint_max_height", "fingerprint_offset_x", "fingerprint_offset_y"):
+        if fingerprint_config.get(key) is not None:
+            _number(fingerprint_config[key], f"fingerprint.{key}", problems, None)
+    grid = _section(fingerprint_config, "grid", "fingerprint.grid", problems)
+    if grid.get("omit_chance") is not None:
+        chance = _number(grid["omit_chance"], "fingerprint.grid.omit_chance", problems, None, minimum=0)
+        if chance is not None and chance > 1:
+            problems.append(f"fingerprint.grid.omit_chance muss zwischen 0 und 1 liegen, nicht {chance!r}")
+    sides = fingerprint_config.get("enabled_sides", DEFAULT_SIDES)
+    if not (isinstance(sides, list) and all(side in DEFAULT_SIDES for side in sides)):
+        problems.append(f"fingerprint.enabled_sides muss eine Liste aus {', '.join(DEFAULT_SIDES)} sein, nicht {sides!r}")
+    bg_color = fingerprint_config.get("background_color", [255, 255, 255])
+    if not (isinstance(bg_color, list) and len(bg_color) in (3, 4)
+            and all(isinstance(c, int) and not isinstance(c, bool) and 0 <= c <= 255 for c in bg_color)):
+        problems.append(f"fingerprint.background_color muss [R, G, B] oder [R, G, B, A] mit Werten 0–255 sein, nicht {bg_color!r}")
+    return {**fingerprint_config, "input_image": input_image}
+
+
+def compile_module(config):
+    """
+    Prüft und übersetzt die zusammengeführte Config eines Moduls in ein CompiledModule.
+    Alle Fehler (Tippfehler in Pfaden, fehlende Dateien, unbekannte Farben, falsche Typen)
+    werden gesammelt und als ConfigError gemeldet, bevor irgendein Pixel gezeichnet wird.
+    Ein bereits kompiliertes Modul wird unverändert zurückgegeben.
+    """
+    if isinstance(config, CompiledModule):
+        return config
+    module_config = extract_module_config(config)
+    if not isinstance(module_config, dict):
+        raise ConfigError("unknown", ["Modul muss ein JSON-Objekt sein"])
+    module_id = module_config.get('id', module_config.get('title', 'unknown'))
+    problems = []
+
+    # Ausgabe: Format, Profile und Canvas
+    output = output_settings(config)
+    try:
+        save_options(output)
+        profiles = output_profiles(config, module_config)
+    except ValueError as e:
+        problems.append(str(e))
+        profiles = []
+    width, height = _pair(config.get("output_size", list(BASE_SIZE)), "output_size", problems, BASE_SIZE)
+    if not (isinstance(width, int) and isinstance(height, int) and width >= 1 and height >= 1):
+        problems.append(f"output_size muss aus positiven ganzen Zahlen bestehen, nicht {[width, height]!r}")
+        width, height = BASE_SIZE
+    slices = _number(config.get("slice_count", 3), "slice_count", problems, 3, minimum=1, integer=True)
+    if slices > width:
+        problems.append(f"slice_count ({slices}) ist größer als die Ausgabebreite ({width})")
+        slices = 1
+    canvas = Canvas(width, height, slices)
+    scale = canvas.scale
+
+    def scaled(value):
+        return int(value * scale)
+
+    # Silbentrennung
+    hyphenation_config = _section(config, "hyphenation", "hyphenation", problems)
+    hyphen = _text(hyphenation_config.get("hyphen", "-"), "hyphenation.hyphen", problems)
+    hyphen_lang = None
+    if _flag(hyphenation_config.get("enabled", False), "hyphenation.enabled", problems, False):
+        hyphen_lang = _text(hyphenation_config.get("lang", "de_DE"), "hyphenation.lang", problems) or None
+        if hyphen_lang and not is_supported_language(hyphen_lang):
+            problems.append(f"hyphenation.lang: kein Silbentrennungs-Wörterbuch für '{hyphen_lang}'")
+            hyphen_lang = None
+
+    # Schriften je Text-Slot: Modul-Config vor flacher Hauptconfig
+    font_config = _section(module_config, "fonts", "fonts", problems)
+    fonts = {}
+    for key, (default_path, default_size) in FONT_DEFAULTS.items():
+        spec = _section(font_config, key, f"fonts.{key}", problems)
+        size = _number(spec.get("size", config.get(f"{key}_font_size", default_size)), f"fonts.{key}.size",
+                       problems, default_size, minimum=1)
+        font_path = spec.get("path", config.get(f"{key}_font_path", default_path))
+        if isinstance(font_path, str) and font_path:
+            font_path = resolve_font_path(font_path)
+            _asset(font_path, f"Font fonts.{key}.path", problems, "font")
+        else:
+            problems.append(f"fonts.{key}.path muss ein Dateipfad sein, nicht {font_path!r}")
+            font_path = resolve_font_path(default_path)
+        max_height = spec.get("max_height")
+        if max_height is not None:
+            max_height = scaled(_number(max_height, f"fonts.{key}.max_height", problems, height))
+        min_size = _number(spec.get("min_size", FIT_MIN_SIZE), f"fonts.{key}.min_size", problems, FIT_MIN_SIZE, minimum=0)
+        fonts[key] = FontSlot(font_path, scaled(size), bool(spec.get("fit")), max(1, scaled(min_size)), max_height)
+
+    # Display-Flags, Offsets und Abstände (Modul-Config vor flacher Hauptconfig)
+    disp = _section(module_config, "display", "display", problems)
+    def show(key, flat_key, default):
+        return _flag(disp.get(key, config.get(flat_key, default)), f"display.{key}", problems, default)
+    offs = _section(module_config, "offsets", "offsets", problems)
+    def offset(slice_key, key):
+        value = _section(offs, slice_key, f"offsets.{slice_key}", problems).get(key, [0, 0])
+        x, y = _pair(value, f"offsets.{slice_key}.{key}", problems)
+        return (scaled(x), scaled(y))
+    spacings = _section(module_config, "spacings", "spacings", problems)
+    sp1 = _section(spacings, "slice1", "spacings.slice1", problems)
+    sp3 = _section(spacings, "slice3", "spacings.slice3", problems)
+    def spacing(section, path, key, default):
+        value = _section(section, path.rsplit(".", 1)[-1], path, problems).get(key, default)
+        return scaled(_number(value, f"{path}.{key}", problems, default))
+
+    padding = scaled(50)
+    info_ls = spacing(sp1, "spacings.slice1.info", "line_spacing", 10)
+    info3_ls = spacing(sp3, "spacings.slice3.info", "line_spacing", config.get("slice3_line_spacing", 10))
+    sem_marg = _section(spacings, "semester", "spacings.semester", problems).get("margin", [50, 50])
+    margin_h, margin_v = _pair(sem_marg, "spacings.semester.margin", problems, (50, 50))
+    semester_margin = (scaled(margin_h), scaled(margin_v))
+    box3_yoff = _number(sp3.get("box_y_offset", config.get("slice3_box_y_offset", 0)), "spacings.slice3.box_y_offset", problems, 0)
+
+    # Texte
+    lect_cfg = _section(module_config, "lecturer", "lecturer", problems)
+    title = module_config.get("title") or module_config.get("id", "")
+    texts = {
+        "title": TextBlock(
+            _text(title, "title", problems), fonts["title"], offset("slice1", "title"),
+            spacing(sp1, "spacings.slice1.title", "line_spacing", 10), spacing(sp1, "spacings.slice1.title", "padding", 0),
+            show("title_box", "slice1_title_box_enabled", False)),
+        "slice1_info": TextBlock(
+            _text(module_config.get("slice1_info") or "", "slice1_info", problems), fonts["slice1_info"], offset("slice1", "info"),
+            info_ls, spacing(sp1, "spacings.slice1.info", "padding", 50), show("info_box", "slice1_box_enabled", False)),
+        "semester": TextBlock(
+            _text(module_config.get("semester") or "", "semester", problems), fonts["semester"], offset("slice1", "semester"),
+            show_box=show("semester_box", "slice1_semester_box_enabled", True)),
+        "lecturer": TextBlock(
+            _text(lect_cfg.get("name") or "", "lecturer.name", problems), fonts["lecturer"], offset("slice2", "lecturer"),
+            info_ls, padding, show("lecturer_box", "slice2_box_enabled", True)),
+        "slice3_info": TextBlock(
+            _text(module_config.get("slice3_info") or "", "slice3_info", problems), fonts["slice3_info"], offset("slice3", "info"),
+            info3_ls, padding, show("footer_box", "slice3_box_enabled", True)),
+    }
+
+    # Dozentenbild
+    photo = None
+    photo_path = lect_cfg.get("photo")
+    if photo_path:
+        if isinstance(photo_path, str):
+            photo_path = resolve_photo_path(photo_path)
+            _asset(photo_path, "Dozentenbild lecturer.photo", problems, "image")
+        else:
+            problems.append(f"lecturer.photo muss ein Dateipfad sein, nicht {photo_path!r}")
+            photo_path = None
+        size = tuple(scaled(_number(lect_cfg.get(key, 400), f"lecturer.{key}", problems, 400, minimum=1))
+                     for key in ("target_width", "target_height"))
+        photo_offset = tuple(scaled(_number(lect_cfg.get(key, 0), f"lecturer.{key}", problems, 0))
+                             for key in ("offset_x", "offset_y"))
+        photo = Photo(photo_path, size, photo_offset) if photo_path else None
+
+    colors = _compile_colors(config, module_config, problems)
+    fingerprint = _compile_fingerprint(module_config, problems)
+    box_radius = _number(config.get("box_radius", 20), "box_radius", problems, 20, minimum=0)
+
+    if problems:
+        # Derselbe Abschnitt kann mehrfach geprüft werden; jeden Fehler nur einmal melden
+        raise ConfigError(module_id, dict.fromkeys(problems))
+
+    # Alle Dateien, von denen die Ausgabe abhängt (für Render-Cache und Watch-Modus)
+    asset_paths = [palette_path] + [slot.path for slot in fonts.values()]
+    if photo:
+        asset_paths.append(photo.path)
+    if fingerprint:
+        asset_paths.append(fingerprint["input_image"])
+
+    return CompiledModule(
+        config=config,
+        module_config=module_config,
+        module_id=module_id,
+        output_path=config.get("output_path", "output"),
+        preview=is_preview(config),
+        output=output,
+        profiles=profiles,
+        canvas=canvas,
+        hyphen_lang=hyphen_lang,
+        hyphen=hyphen,
+        texts=texts,
+        semester_margin=semester_margin,
+        slice3_box_y_offset=scaled(box3_yoff),
+        photo=photo,
+        padding=padding,
+        box_radius=scaled(box_radius),
+        outline_width=max(1, round(4 * scale)),
+        colors=colors,
+        fingerprint=fingerprint,
+        asset_paths=asset_paths,
+    )
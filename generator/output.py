@@ -0,0 +1,139 @@
+import io
+import os
+
+from .instrument import stage
+
+# Dateiendung und Pillow-Formatname je unterstütztem Ausgabeformat
+FORMATS = {
+    "png":  (".png",  "PNG"),
+    "jpeg": (".jpg",  "JPEG"),
+    "jpg":  (".jpg",  "JPEG"),
+    "webp": (".webp", "WEBP"),
+}
+
+
+def output_settings(config):
+    """Liest den Abschnitt "output" der Hauptkonfiguration (fehlend = bisheriges Verhalten: PNG)."""
+    cfg = config.get("output")
+    return cfg if isinstance(cfg, dict) else {}
+
+
+def save_options(settings):
+    """Dateiendung, Pillow-Format und Encoder-Parameter für die Ausgabe."""
+    fmt = str(settings.get("format", "png")).lower()
+    if fmt not in FORMATS:
+        raise ValueError(f"Unbekanntes Ausgabeformat '{fmt}' (erlaubt: png, jpeg, webp)")
+    ext, pil_format = FORMATS[fmt]
+    if pil_format == "PNG":
+        params = {"compress_level": int(settings.get("compress_level", 6))}
+    elif pil_format == "JPEG":
+        params = {
+            "quality": int(settings.get("quality", 90)),
+            "optimize": bool(settings.get("optimize", True)),
+            "progressive": bool(settings.get("progressive", False)),
+        }
+    else:
+        params = {
+            "lossless": bool(settings.get("lossless", True)),
+            "quality": int(settings.get("quality", 90)),
+            "method": int(settings.get("method", 4)),
+        }
+    return ext, pil_format, params
+
+
+def carousel_images(full, slice_boxes, settings):
+    """
+    (Dateiname, Bild) für das Gesamtbild (optional) und alle Slices.
+    Das RGB-Bild wird einmal erzeugt, die Slices daraus ausgeschnitten.
+    """
+    ext, _, _ = save_options(settings)
+    rgb = full.convert("RGB") if full.mode != "RGB" else full
+    images = []
+    if settings.get("write_full", True):
+        images.append((f"post{ext}", rgb))
+    for i, box in enumerate(slice_boxes):
+        images.append((f"post_{i+1}{ext}", rgb.crop(box)))
+    return images
+
+
+# Standard für output.workers; in Worker-Prozessen über limit_encoder_threads verkleinert
+encoder_threads = os.cpu_count() or 1
+
+
+def limit_encoder_threads(process_workers):
+    """
+    Initializer für Worker-Prozesse: teilt die CPU-Kerne auf die Prozesse auf,
+    damit N Prozesse mit je cpu_count Encoder-Threads die Maschine nicht überbuchen.
+    Ein explizites output.workers in der Config gilt weiterhin.
+    """
+    global encoder_threads
+    encoder_threads = max(1, (os.cpu_count() or 1) // max(1, process_workers))
+
+
+def _map_encoders(func, items, settings):
+    """Kodiert parallel in einem Thread-Pool (Pillow gibt beim Kodieren die GIL frei)."""
+    workers = max(1, min(len(items), int(settings.get("workers", encoder_threads))))
+    if workers == 1:
+        return [func(item) for item in items]
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(func, items))
+
+
+def save_carousel(full, slice_boxes, output_dir, settings):
+    """
+    Speichert das Gesamtbild (optional) und alle Slices.
+    Gibt die geschriebenen Pfade in fester Reihenfolge zurück.
+    """
+    _, pil_format, params = save_options(settings)
+
+    def encode(item):
+        name, image = item
+        path = os.path.join(output_dir, name)
+        image.save(path, format=pil_format, **params)
+        return path
+
+    written = _map_encoders(encode, carousel_images(full, slice_boxes, settings), settings)
+    first_slice = 1 if settings.get("write_full", True) else 0
+    for i, path in enumerate(written):
+        if i < first_slice:
+            print(f"✅ Full image saved: {path}")
+        else:
+            print(f"✅ Slice {i - first_slice + 1} gespeichert: {path}")
+    return written
+
+
+def save_slices(paint, slice_boxes, output_dir, settings):
+    """
+    Speichert die Slices nacheinander, ohne dass ein Gesamtbild existiert:
+    paint(box) zeichnet einen Slice in einen eigenen Puffer, der nach dem Kodieren
+    sofort freigegeben wird. Es liegt also immer nur ein Slice im Speicher.
+    Gibt die geschriebenen Pfade zurück; ein Gesamtbild (write_full) gibt es hier nicht.
+    """
+    ext, pil_format, params = save_options(settings)
+    written = []
+    for i, box in enumerate(slice_boxes):
+        image = paint(box)
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        path = os.path.join(output_dir, f"post_{i+1}{ext}")
+        with stage("encode"):
+            image.save(path, format=pil_format, **params)
+        del image
+        print(f"✅ Slice {i + 1} gespeichert: {path}")
+        written.append(path)
+    return written
+
+
+def encode_carousel(full, slice_boxes, settings):
+    """Wie save_carousel, aber im Speicher: gibt [(Dateiname, Bytes), ...] zurück."""
+    _, pil_format, params = save_options(settings)
+
+    def encode(item):
+        name, image = item
+        buf = io.BytesIO()
+        image.save(buf, format=pil_format, **params)
+        return name, buf.getvalue()
+
+    return _map_encoders(encode, carousel_images(full, slice_boxes, settings), settings)
@@ -0,0 +1,74 @@
+import os
+
+from .cache import ImageLRUCache, cache_dir, cache_settings, config_digest, file_digest, load_cached_image, store_cached_image
+
+# Prozessweiter Speicher fertig skalierter Dozentenbilder (Größe über cache.photo_memory_mb)
+memory_cache = ImageLRUCache(128 * 1024 * 1024)
+disk_stats = {"hits": 0, "writes": 0}
+
+
+def build_lecturer_image(photo_path, target_w, target_h, resample=None):
+    """
+    Skaliert das Dozentenbild per "contain" in die Zielbox und zentriert es
+    auf einer transparenten Fläche der Größe target_w × target_h.
+    JPEGs werden per Draft-Modus bereits nahe der Zielgröße dekodiert.
+    resample=None steht für Image.LANCZOS.
+    """
+    from PIL import Image
+
+    if resample is None:
+        resample = Image.LANCZOS
+    prof_img = Image.open(photo_path)
+    w, h = prof_img.size
+    # Always use "contain" mode
+    ratio = min(target_w / w, target_h / h)
+    new_size = (int(w * ratio), int(h * ratio))
+    prof_img.draft("RGB", new_size)
+    resized = prof_img.convert("RGBA").resize(new_size, resample)
+    # Dozentenbild rechteckig mit transparentem Hintergrund einfügen
+    canvas_img = Image.new("RGBA", (target_w, target_h), (0, 0, 0, 0))
+    paste_pos = ((target_w - new_size[0]) // 2, (target_h - new_size[1]) // 2)
+    canvas_img.paste(resized, paste_pos, resized)
+    return canvas_img
+
+
+def load_lecturer_image(config, photo_path, target_w, target_h, scale=1.0, resample=None):
+    """
+    Wie build_lecturer_image, aber mit LRU-Cache im Speicher und auf der Platte,
+    geschlüsselt nach (Bild-Hash, Zielbox, Skalierung, Resampling).
+    Das zurückgegebene Bild ist geteilt und darf nicht verändert werden.
+    """
+    if resample is None:
+        from PIL import Image
+        resample = Image.LANCZOS
+    settings = cache_settings(config)
+    if not settings.get("photos", True):
+        return build_lecturer_image(photo_path, target_w, target_h, resample)
+
+    memory_cache.max_bytes = int(settings.get("photo_memory_mb", 128) * 1024 * 1024)
+    key = config_digest({
+        "photo": file_digest(photo_path),
+        "target": [target_w, target_h],
+        "scale": scale,
+        "resample": int(resample),
+    })
+
+    image = memory_cache.get(key)
+    if image is not None:
+        return image
+
+    disk_path = None
+    if settings.get("photos_disk", True):
+        disk_path = os.path.join(cache_dir(config, "photos"), f"{key}.png")
+        image = load_cached_image(disk_path)
+        if image is not None:
+            disk_stats["hits"] += 1
+            memory_cache.put(key, image)
+            return image
+
+    image = build_lecturer_image(photo_path, target_w, target_h, resample)
+    memory_cache.put(key, image)
+    if disk_path:
+        store_cached_image(disk_path, image)
+        disk_stats["writes"] += 1
+    return image
@@ -0,0 +1,140 @@
+import queue
+import threading
+import time
+
+# Markiert das Ende des Datenstroms in den Queues
+_DONE = object()
+
+
+class StageStats:
+    """Zähler einer Pipeline-Stufe: Arbeitszeit, Wartezeiten und Füllstand der Eingangs-Queue."""
+
+    def __init__(self, name):
+        self.name = name
+        self.items = 0
+        self.errors = 0
+        self.busy = 0.0      # in der Stufenfunktion (Stufe 1: inkl. Lesen der Quelle)
+        self.starved = 0.0   # auf ein Element der vorigen Stufe gewartet
+        self.blocked = 0.0   # auf Platz in der Queue zur nächsten Stufe gewartet
+        self.depth_samples = 0
+        self.depth_sum = 0
+        self.depth_max = 0
+
+    def sample_depth(self, depth):
+        self.depth_samples += 1
+        self.depth_sum += depth
+        self.depth_max = max(self.depth_max, depth)
+
+    def summary(self):
+        return {
+            "stage": self.name,
+            "items": self.items,
+            "errors": self.errors,
+            "busy_s": round(self.busy, 3),
+            "starved_s": round(self.starved, 3),
+            "blocked_s": round(self.blocked, 3),
+            "queue_avg": round(self.depth_sum / self.depth_samples, 2) if self.depth_samples else None,
+            "queue_max": self.depth_max if self.depth_samples else None,
+        }
+
+
+class Pipeline:
+    """
+    Führt Elemente durch eine Folge von Stufen, jede in einem eigenen Thread und
+    verbunden über Queues mit höchstens depth Elementen. Eine Stufe ist (Name, Funktion):
+    die Funktion bekommt den Wert der vorigen Stufe (Stufe 1: das Element) und gibt den
+    Wert für die nächste zurück. Löst sie eine Ausnahme aus, überspringt das Element die
+    restlichen Stufen und kommt mit dem Fehler heraus. Die Quelle liest der erste Thread.
+
+    Threads lohnen sich hier, weil Pillow beim Dekodieren, Skalieren und Kodieren die GIL
+    freigibt; eine Stufe darf also rechnen, während die nächste schreibt.
+    """
+
+    def __init__(self, stages, depth=2):
+        self.stages = list(stages)
+        self.depth = max(1, int(depth))
+        self.stats = [StageStats(name) for name, _ in self.stages]
+        self.wall = 0.0
+        self._source_error = None
+
+    def _worker(self, index, source, queues):
+        _, func = self.stages[index]
+        stats = self.stats[index]
+        inbox = queues[index - 1] if index else None
+        outbox = queues[index]
+        try:
+            while True:
+                start = time.perf_counter()
+                if inbox is None:
+                    try:
+                        item = next(source)
+                    except StopIteration:
+                        return
+                    except Exception as e:
+                        self._source_error = e
+                        return
+                    envelope = (item, item, None)
+                    stats.busy += time.perf_counter() - start
+                else:
+                    envelope = inbox.get()
+                    stats.starved += time.perf_counter() - start
+                    if envelope is _DONE:
+                        return
+                    # Füllstand beim Abholen, einschließlich des gerade geholten Elements
+                    stats.sample_depth(inbox.qsize() + 1)
+
+                item, value, error = envelope
+                if error is None:
+                    start = time.perf_counter()
+                    try:
+                        value = func(value)
+                    except Exception as e:
+                        error = e
+                        stats.errors += 1
+                    stats.busy += time.perf_counter() - start
+                    stats.items += 1
+
+                start = time.perf_counter()
+                outbox.put((item, value, error))
+                stats.blocked += time.perf_counter() - start
+        finally:
+            outbox.put(_DONE)
+
+    def run(self, items):
+        """Generator über (Element, Ergebnis, Fehler) in Eingangsreihenfolge."""
+        start = time.perf_counter()
+        source = iter(items)
+        queues = [queue.Queue(maxsize=self.depth) for _ in self.stages]
+        threads = [
+            threading.Thread(target=self._worker, args=(i, source, queues), name=f"pipeline-{name}", daemon=True)
+            for i, (name, _) in enumerate(self.stages)
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            while True:
+                envelope = queues[-1].get()
+                if envelope is _DONE:
+                    break
+                item, value, error = envelope
+                yield item, (None if error else value), error
+        finally:
+            self.wall = time.perf_counter() - start
+        for thread in threads:
+            thread.join()
+        if self._source_error is not None:
+            raise self._source_error
+
+    def summary(self):
+        return {"depth": self.depth, "wall_s": round(self.wall, 3), "stages": [s.summary() for s in self.stats]}
+
+    def report(self):
+        """Gibt Arbeits- und Wartezeiten je Stufe aus; die Stufe mit der meisten Arbeit bremst den Durchsatz."""
+        print(f"\n[INFO] Pipeline (Queue-Tiefe {self.depth}, {self.wall:.2f}s):")
+        print(f"  {'Stufe':<8}  {'Elemente':>8}  {'Arbeit':>8}  {'Wartet':>8}  {'Blockiert':>9}  {'Queue Ø/max':>11}")
+        for s in self.stats:
+            depth = "-" if not s.depth_samples else f"{s.depth_sum / s.depth_samples:.1f}/{s.depth_max}"
+            print(f"  {s.name:<8}  {s.items:>8}  {s.busy:>7.2f}s  {s.starved:>7.2f}s  {s.blocked:>8.2f}s  {depth:>11}")
+        if self.stats and self.wall > 0:
+            slowest = max(self.stats, key=lambda s: s.busy)
+            print(f"  Engpass: {slowest.name} ({slowest.busy / self.wall:.0%} der Laufzeit beschäftigt)")
@@ -0,0 +1,51 @@
+import os
+
+from .output import output_settings
+
+# Standardwerte des Vorschau-Modus (überschreibbar über den Abschnitt "preview" der Config)
+PREVIEW_DEFAULTS = {
+    "scale": 0.25,
+    "format": "jpeg",
+    "quality": 75,
+    "dir": "preview",
+}
+
+
+def preview_settings(config):
+    cfg = config.get("preview")
+    return {**PREVIEW_DEFAULTS, **(cfg if isinstance(cfg, dict) else {})}
+
+
+def is_preview(config):
+    """True, wenn config mit preview_config erzeugt wurde (schnelles Resampling beim Zeichnen)."""
+    cfg = config.get("preview")
+    return isinstance(cfg, dict) and cfg.get("active", False)
+
+
+def preview_config(config):
+    """
+    Leitet aus einer Render-Config die Vorschau-Config ab: Ausgabegröße um preview.scale
+    verkleinert (Layout skaliert über den bestehenden scale-Faktor mit), schnelle
+    JPEG-/WebP-Kodierung und ein eigener Unterordner neben der finalen Ausgabe.
+    Fingerprint und Dozentenbild werden dadurch automatisch in kleiner Auflösung erzeugt.
+    """
+    settings = preview_settings(config)
+    width, height = config.get("output_size", [3240, 1350])
+    factor = float(settings["scale"])
+    fmt = str(settings["format"]).lower()
+
+    output = {**output_settings(config), "format": fmt, "quality": int(settings["quality"])}
+    if fmt in ("jpeg", "jpg"):
+        output.update(optimize=False, progressive=False)
+    elif fmt == "webp":
+        output.update(lossless=False, method=0)
+    else:
+        output.update(compress_level=1)
+
+    return {
+        **config,
+        "output_size": [max(1, round(width * factor)), max(1, round(height * factor))],
+        "output": output,
+        "output_path": os.path.join(config.get("output_path", "output"), settings["dir"]),
+        "preview": {**settings, "active": True},
+    }
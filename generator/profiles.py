@@ -0,0 +1,90 @@
+import os
+
+
+def output_profiles(config, module_config=None):
+    """
+    Zusätzliche Ausgabegrößen: "output_profiles" der Modul-Config, sonst der Hauptconfig.
+    Einträge sind [Breite, Höhe] oder {"name", "size", "native", "output"};
+    zurückgegeben werden normalisierte Dicts (Standardname "<Breite>x<Höhe>").
+    """
+    module_config = module_config or {}
+    entries = module_config.get("output_profiles", config.get("output_profiles")) or []
+    if not isinstance(entries, list):
+        raise ValueError('"output_profiles" muss eine Liste sein')
+    profiles = []
+    names = set()
+    for entry in entries:
+        spec = entry if isinstance(entry, dict) else {"size": entry}
+        size = spec.get("size")
+        if not (isinstance(size, (list, tuple)) and len(size) == 2):
+            raise ValueError(f"Ausgabeprofil ohne gültige Größe [Breite, Höhe]: {entry!r}")
+        width, height = int(size[0]), int(size[1])
+        if width < 1 or height < 1:
+            raise ValueError(f"Ausgabeprofil mit ungültiger Größe: {entry!r}")
+        name = os.path.basename(str(spec.get("name") or f"{width}x{height}"))
+        if name in names:
+            raise ValueError(f"Ausgabeprofil '{name}' ist doppelt vorhanden")
+        names.add(name)
+        output = spec.get("output")
+        profiles.append({
+            "name": name,
+            "size": (width, height),
+            "native": bool(spec.get("native", False)),
+            "output": output if isinstance(output, dict) else {},
+        })
+    return profiles
+
+
+def can_derive(profile, size):
+    """
+    True, wenn das Profil durch Verkleinern eines Bildes der Größe size entstehen kann:
+    nicht nativ, nicht größer und (bis auf Rundung) mit gleichem Seitenverhältnis.
+    """
+    width, height = profile["size"]
+    src_w, src_h = size
+    if profile["native"] or width > src_w or height > src_h:
+        return False
+    return abs(width * src_h - height * src_w) <= max(src_w, src_h)
+
+
+def scale_boxes(slice_boxes, src_size, size):
+    """Slice-Boxen eines Bildes der Größe src_size auf size umrechnen."""
+    sx, sy = size[0] / src_size[0], size[1] / src_size[1]
+    return [(round(x0 * sx), round(y0 * sy), round(x1 * sx), round(y1 * sy)) for x0, y0, x1, y1 in slice_boxes]
+
+
+def _downscale(levels, size):
+    """
+    Eine Stufe der Pyramide: ganzzahlige Faktoren per reduce() (Mittelwert über Pixelblöcke)
+    aus der kleinsten passenden Stufe, sonst LANCZOS aus der kleinsten Stufe, die groß genug ist.
+    """
+    from PIL import Image
+
+    width, height = size
+    for source in reversed(levels):
+        if source.size == size:
+            return source
+        if source.width % width == 0 and source.height % height == 0:
+            return source.reduce((source.width // width, source.height // height))
+    sources = [level for level in levels if level.width >= width and level.height >= height] or levels[:1]
+    source = min(sources, key=lambda level: level.width * level.height)
+    return source.resize(size, Image.LANCZOS, reducing_gap=2.0)
+
+
+def resample_pyramid(full, slice_boxes, profiles):
+    """
+    Verkleinert full auf die Größen der Profile, absteigend sortiert: jede Stufe wird
+    aus einer schon berechneten (nächstgrößeren) Stufe abgeleitet statt jedes Mal aus dem Original.
+    Gerechnet wird in RGB, da die Ausgabe ohnehin ohne Alphakanal gespeichert wird.
+    Gibt {Profilname: (Bild, Slice-Boxen)} zurück.
+    """
+    results = {}
+    if not profiles:
+        return results
+    levels = [full.convert("RGB") if full.mode != "RGB" else full]
+    for profile in sorted(profiles, key=lambda p: p["size"][0] * p["size"][1], reverse=True):
+        size = profile["size"]
+        image = _downscale(levels, size)
+        levels.append(image)
+        results[profile["name"]] = (image, scale_boxes(slice_boxes, full.size, size))
+    return results
@@ -0,0 +1,66 @@
+import os
+import json
+
+from .cache import cache_settings, config_digest, file_digest
+
+# Bei inkompatiblen Änderungen am Rendering erhöhen, damit alte Ausgaben neu erzeugt werden
+RENDER_CACHE_VERSION = 3
+
+# Name der Stempeldatei im Ausgabeordner eines Moduls
+STAMP_FILE = ".render_cache.json"
+
+# Treffer/Fehlschläge dieses Prozesses
+stats = {"hits": 0, "misses": 0}
+
+
+def is_enabled(config):
+    return bool(cache_settings(config).get("render", True))
+
+
+def render_key(config, asset_paths):
+    """
+    Schlüssel einer Modul-Ausgabe: Hash der zusammengeführten Konfiguration
+    plus Content-Hashes aller referenzierten Assets (Palette, Fonts, Bilder).
+    """
+    assets = {os.path.abspath(p): file_digest(p) for p in asset_paths if p}
+    return config_digest({
+        "version": RENDER_CACHE_VERSION,
+        "config": config,
+        "assets": assets,
+    })
+
+
+def lookup(output_dir, key):
+    """True, wenn im Ausgabeordner ein passender Stempel liegt und alle Dateien noch existieren."""
+    stamp_path = os.path.join(output_dir, STAMP_FILE)
+    try:
+        with open(stamp_path, encoding="utf-8") as f:
+            stamp = json.load(f)
+    except (OSError, ValueError):
+        stats["misses"] += 1
+        return False
+    hit = stamp.get("key") == key and all(
+        os.path.exists(os.path.join(output_dir, name)) for name in stamp.get("files", [])
+    )
+    stats["hits" if hit else "misses"] += 1
+    return hit
+
+
+def store(output_dir, key, files):
+    """
+    Schreibt den Stempel nach erfolgreichem Speichern aller Ausgabedateien.
+    Pfade relativ zum Ausgabeordner, damit auch Dateien der Ausgabegrößen in Unterordnern geprüft werden.
+    """
+    stamp = {"key": key, "files": [os.path.relpath(p, output_dir) for p in files]}
+    tmp_path = os.path.join(output_dir, STAMP_FILE + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(stamp, f, indent=2)
+    os.replace(tmp_path, os.path.join(output_dir, STAMP_FILE))
+
+
+def invalidate(output_dir):
+    """Entfernt den Stempel, z. B. bevor ein Modul neu gerendert wird."""
+    try:
+        os.remove(os.path.join(output_dir, STAMP_FILE))
+    except OSError:
+        pass
@@ -0,0 +1,125 @@
+import os
+import json
+import threading
+from collections import OrderedDict
+
+from .cache import cache_dir, cache_settings, config_digest, file_digest
+
+# Bei Änderungen am Layout-Format oder an der Layout-Berechnung erhöhen
+SCENE_VERSION = 4
+
+# Konfigurationswerte, die nur das Zeichnen betreffen (Farben, Hintergrund, Ausgabe);
+# Änderungen daran verwenden ein vorhandenes Layout weiter
+PAINT_ONLY_CONFIG_KEYS = ("background", "output", "output_path", "output_dir", "output_profiles", "cache", "modules")
+PAINT_ONLY_MODULE_KEYS = ("background", "box_colors", "text_colors", "palette_overrides", "fingerprint", "output_profiles")
+
+stats = {"hits": 0, "misses": 0, "disk_hits": 0, "writes": 0}
+
+
+class LayoutLRUCache:
+    """Kleiner LRU-Speicher für Layouts, begrenzt nach Anzahl der Einträge."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            layout = self._items.get(key)
+            if layout is not None:
+                self._items.move_to_end(key)
+            return layout
+
+    def put(self, key, layout):
+        with self._lock:
+            self._items[key] = layout
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+memory_cache = LayoutLRUCache(256)
+
+
+def layout_key(config, module_config, font_paths):
+    """
+    Schlüssel eines Layouts: alle Config-Werte außer den reinen Zeichenwerten
+    plus die Content-Hashes der Fonts (deren Metriken bestimmen den Umbruch).
+    """
+    return config_digest({
+        "version": SCENE_VERSION,
+        "config": {k: v for k, v in config.items() if k not in PAINT_ONLY_CONFIG_KEYS},
+        "module": {k: v for k, v in module_config.items() if k not in PAINT_ONLY_MODULE_KEYS},
+        "fonts": {os.path.abspath(p): file_digest(p) for p in font_paths},
+    })
+
+
+def load_layout(config, key):
+    """Layout aus dem Speicher- oder Platten-Cache (None, falls nicht vorhanden oder abgeschaltet)."""
+    settings = cache_settings(config)
+    if not settings.get("scenes", True):
+        return None
+    layout = memory_cache.get(key)
+    if layout is not None:
+        stats["hits"] += 1
+        return layout
+    if settings.get("scenes_disk", True):
+        try:
+            with open(os.path.join(cache_dir(config, "scenes"), f"{key}.json"), encoding="utf-8") as f:
+                layout = json.load(f)
+        except (OSError, ValueError):
+            layout = None
+        if layout is not None and layout.get("version") == SCENE_VERSION:
+            stats["disk_hits"] += 1
+            memory_cache.put(key, layout)
+            return layout
+    stats["misses"] += 1
+    return None
+
+
+def store_layout(config, key, layout):
+    settings = cache_settings(config)
+    if not settings.get("scenes", True):
+        return
+    memory_cache.put(key, layout)
+    if settings.get("scenes_disk", True):
+        write_json(os.path.join(cache_dir(config, "scenes"), f"{key}.json"), layout)
+        stats["writes"] += 1
+
+
+def write_json(path, obj):
+    """Schreibt JSON atomar, mit sortierten Schlüsseln (gut diffbar)."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2, sort_keys=True, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def diff_scenes(a, b, path=""):
+    """
+    Vergleicht zwei Szenen und gibt die Pfade der abweichenden Werte zurück,
+    z. B. ["colors.box:slice1", "layout.items[3].lines[0]"].
+    """
+    if isinstance(a, dict) and isinstance(b, dict):
+        changes = []
+        for key in sorted(set(a) | set(b), key=str):
+            sub = f"{path}.{key}" if path else str(key)
+            if key not in a or key not in b:
+                changes.append(sub)
+            else:
+                changes += diff_scenes(a[key], b[key], sub)
+        return changes
+    if isinstance(a, (list, tuple)) and isinstance(b, (list, tuple)):
+        if len(a) != len(b):
+            return [path]
+        changes = []
+        for i, (x, y) in enumerate(zip(a, b)):
+            changes += diff_scenes(x, y, f"{path}[{i}]")
+        return changes
+    return [] if a == b else [path]
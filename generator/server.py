@@ -0,0 +1,254 @@
+import io
+import json
+import mimetypes
+import threading
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from . import generator
+from .model import compile_module
+from .output import limit_encoder_threads
+from .preview import preview_config
+from .hyphenation import get_hyphenator
+
+
+class Overloaded(Exception):
+    """Alle Worker belegt und die Warteschlange voll."""
+
+
+def _warm_worker(hyphenation_config, workers):
+    """Start eines Worker-Prozesses: Encoder-Threads begrenzen, Silbentrennungs-Wörterbuch vorab laden."""
+    limit_encoder_threads(workers)
+    if hyphenation_config.get("enabled", False):
+        get_hyphenator(hyphenation_config.get("lang", "de_DE"))
+
+
+def _render(module):
+    """Läuft im Worker-Prozess; Fonts, Layouts, Fingerprints und Fotos bleiben dort im Cache."""
+    start = time.perf_counter()
+    files = generator.render_carousel_bytes(module)
+    return files, time.perf_counter() - start
+
+
+class LatencyStats:
+    """Gleitendes Fenster der letzten Messwerte mit Perzentilen in Millisekunden."""
+
+    def __init__(self, window=1000):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def add(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def summary(self):
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return {"count": 0}
+
+        def pct(p):
+            return round(samples[min(len(samples) - 1, int(p * len(samples)))] * 1000, 1)
+
+        return {"count": len(samples), "p50_ms": pct(0.50), "p95_ms": pct(0.95), "p99_ms": pct(0.99),
+                "max_ms": round(samples[-1] * 1000, 1)}
+
+
+class RenderService:
+    """
+    Rendert Module in einem festen Pool langlebiger Worker-Prozesse.
+    Höchstens workers Renderings laufen gleichzeitig, weitere max_queue warten;
+    darüber hinaus wird mit Overloaded abgelehnt.
+    """
+
+    def __init__(self, base_config, workers, max_queue):
+        self.base_config = base_config
+        self.workers = workers
+        self.max_queue = max_queue
+        self.pool = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_warm_worker,
+            initargs=(base_config.get("hyphenation", {}), workers),
+        )
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+        self._lock = threading.Lock()
+        self.counters = {"requests": 0, "ok": 0, "errors": 0, "rejected": 0, "pending": 0}
+        self.latency = LatencyStats()
+        self.render_time = LatencyStats()
+        self.queue_time = LatencyStats()
+
+    def _count(self, key, delta=1):
+        with self._lock:
+            self.counters[key] += delta
+
+    def merged_config(self, payload):
+        """
+        Baut die Render-Config wie main.py: Basis-Config plus Modul.
+        payload ist ein einzelnes Modul oder {"modules": [...], ...}; weitere Schlüssel
+        überschreiben dann die Basis-Config (z. B. "output").
+        """
+        if not isinstance(payload, dict):
+            raise ValueError("JSON-Objekt erwartet")
+        if "modules" in payload:
+            modules = payload["modules"]
+            if not isinstance(modules, list) or not modules or not isinstance(modules[0], dict):
+                raise ValueError('"modules" muss eine nicht leere Liste von Objekten sein')
+            overrides = {k: v for k, v in payload.items() if k != "modules"}
+            return {**self.base_config, **overrides, "modules": [modules[0]]}
+        return {**self.base_config, "modules": [payload]}
+
+    def render(self, module):
+        """Rendert ein kompiliertes Modul; gibt ([(Dateiname, Bytes), ...], Renderzeit, Wartezeit) zurück."""
+        self._count("requests")
+        if not self._slots.acquire(blocking=False):
+            self._count("rejected")
+            raise Overloaded()
+        self._count("pending")
+        start = time.perf_counter()
+        try:
+            files, render_s = self.pool.submit(_render, module).result()
+        except Exception:
+            self._count("errors")
+            raise
+        finally:
+            self._count("pending", -1)
+            self._slots.release()
+        total = time.perf_counter() - start
+        self._count("ok")
+        self.latency.add(total)
+        self.render_time.add(render_s)
+        self.queue_time.add(max(0.0, total - render_s))
+        return files, render_s, total - render_s
+
+    def metrics(self):
+        with self._lock:
+            counters = dict(self.counters)
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": min(counters["pending"], self.workers),
+            "queued": max(0, counters["pending"] - self.workers),
+            **{k: v for k, v in counters.items() if k != "pending"},
+            "latency": self.latency.summary(),
+            "render": self.render_time.summary(),
+            "queue_wait": self.queue_time.summary(),
+        }
+
+    def close(self):
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+
+def zip_files(files):
+    buf = io.BytesIO()
+    # Bilder sind bereits komprimiert
+    with zipfile.ZipFile(buf, "w", compression=zipfile.ZIP_STORED) as zf:
+        for name, data in files:
+            zf.writestr(name, data)
+    return buf.getvalue()
+
+
+class RenderHandler(BaseHTTPRequestHandler):
+    """
+    POST /render       Modul-Config als JSON → ZIP mit Gesamtbild und Slices (plus output_profiles)
+    POST /render?format=image&slice=N  → nur Slice N (0 = Gesamtbild)
+    POST /render?preview=1             → schnelle Vorschau in reduzierter Auflösung
+    GET  /metrics      Zähler, Warteschlange und Latenzen als JSON
+    GET  /health       Lebenszeichen
+    """
+
+    server_version = "CarouselRenderer/1.0"
+
+    @property
+    def service(self):
+        return self.server.service
+
+    def send_body(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, status, obj):
+        self.send_body(status, json.dumps(obj, ensure_ascii=False).encode("utf-8"), "application/json; charset=utf-8")
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == "/metrics":
+            self.send_json(200, self.service.metrics())
+        elif path == "/health":
+            self.send_json(200, {"status": "ok"})
+        else:
+            self.send_json(404, {"error": f"Unbekannter Pfad {path}"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != "/render":
+            self.send_json(404, {"error": f"Unbekannter Pfad {url.path}"})
+            return
+        query = parse_qs(url.query)
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            config = self.service.merged_config(json.loads(self.rfile.read(length) or b"null"))
+            if query.get("preview", ["0"])[0] not in ("0", "false", ""):
+                config = preview_config(config)
+            # Ungültige Module (ConfigError) schon hier mit 400 ablehnen, ohne einen Worker zu belegen
+            module = compile_module(config)
+        except ValueError as e:
+            self.send_json(400, {"error": f"Ungültige Anfrage: {e}"})
+            return
+
+        try:
+            files, render_s, queue_s = self.service.render(module)
+        except Overloaded:
+            self.send_json(503, {"error": "Server ausgelastet, bitte später erneut versuchen"})
+            return
+        except Exception as e:
+            self.send_json(500, {"error": f"Rendern fehlgeschlagen: {e}"})
+            return
+
+        headers = {"X-Render-Time": f"{render_s:.3f}", "X-Queue-Time": f"{queue_s:.3f}"}
+        if query.get("format", ["zip"])[0] == "zip":
+            self.send_body(200, zip_files(files), "application/zip", headers)
+            return
+        # Einzelbild: Slice-Nummer 1..n, 0 = Gesamtbild (falls output.write_full); nur Hauptgröße
+        main_files = [f for f in files if "/" not in f[0]]
+        slices = [f for f in main_files if f[0].startswith("post_")]
+        full = [f for f in main_files if not f[0].startswith("post_")]
+        try:
+            index = int(query.get("slice", ["0"])[0])
+            # Keine negativen Python-Indizes: nur 0..n sind gültige Slice-Nummern
+            if not 0 <= index <= len(slices):
+                raise IndexError(index)
+            name, data = full[0] if index == 0 else slices[index - 1]
+        except (ValueError, IndexError):
+            self.send_json(400, {"error": f"Slice nicht vorhanden (verfügbar: {', '.join(f[0] for f in files)})"})
+            return
+        content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        self.send_body(200, data, content_type, headers)
+
+    def log_message(self, format, *args):
+        print(f"[HTTP] {self.address_string()} {format % args}")
+
+
+def serve(base_config, host="127.0.0.1", port=8765, workers=1, max_queue=16):
+    """Startet den Render-Server und blockiert bis Strg+C."""
+    service = RenderService(base_config, workers, max_queue)
+    httpd = ThreadingHTTPServer((host, port), RenderHandler)
+    httpd.daemon_threads = True
+    httpd.service = service
+    print(f"🌐 Render-Server auf http://{host}:{httpd.server_port} ({workers} Worker, Warteschlange {max_queue})")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Render-Server beendet")
+    finally:
+        httpd.server_close()
+        service.close()
+    return 0
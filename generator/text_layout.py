@@ -0,0 +1,166 @@
+import weakref
+from collections import namedtuple
+
+from .hyphenation import split_word
+
+# Eine umbrochene Zeile samt Bounding Box (wie draw.textbbox((0, 0), text, font))
+Line = namedtuple("Line", "text bbox")
+
+
+class FontMetrics:
+    """
+    Wort-Maße eines Fonts: Advance und Bounding Box werden pro Wort einmal gemessen.
+    Die Box einer Zeile ergibt sich daraus ohne erneutes Messen der ganzen Zeile.
+    """
+
+    def __init__(self, font):
+        self.font = font
+        self.space = font.getlength(" ")
+        self._words = {}
+        self._splits = {}
+
+    def word(self, word):
+        """(advance, bbox) eines einzelnen Wortes, gecacht."""
+        entry = self._words.get(word)
+        if entry is None:
+            entry = (self.font.getlength(word), self.font.getbbox(word))
+            self._words[word] = entry
+        return entry
+
+    def width(self, word):
+        """Rechte Kante der Wort-Box (entspricht draw.textbbox(...)[2])."""
+        return self.word(word)[1][2]
+
+    def split(self, word, hyphenator, max_width, hyphen="-"):
+        """Silbentrennung von word für max_width (siehe hyphenation.split_word), gecacht."""
+        key = (word, hyphenator, max_width, hyphen)
+        pieces = self._splits.get(key)
+        if pieces is None:
+            pieces = tuple(split_word(word, hyphenator.positions(word), self.width, max_width, hyphen))
+            self._splits[key] = pieces
+        return pieces
+
+    def line_bbox(self, words):
+        """Bounding Box der mit Leerzeichen verbundenen Wörter."""
+        if not words:
+            return (0, 0, 0, 0)
+        entries = [self.word(w) for w in words]
+        advance = sum(adv for adv, _ in entries[:-1]) + self.space * (len(words) - 1)
+        first_box, last_box = entries[0][1], entries[-1][1]
+        top = min(box[1] for _, box in entries)
+        bottom = max(box[3] for _, box in entries)
+        return (first_box[0], top, round(advance + last_box[2]), bottom)
+
+
+# Maße pro Font-Objekt (Fonts kommen aus der Registry in fonts.py und werden geteilt)
+_metrics = weakref.WeakKeyDictionary()
+
+
+def metrics_for(font):
+    metrics = _metrics.get(font)
+    if metrics is None:
+        metrics = FontMetrics(font)
+        _metrics[font] = metrics
+    return metrics
+
+
+def split_long_words(words, metrics, max_width, hyphenator=None, hyphen="-"):
+    """Trennt zu breite Wörter an Silbengrenzen, bei Bedarf mehrfach (Ergebnis je Font gecacht)."""
+    if not hyphenator:
+        return list(words)
+    result = []
+    for word in words:
+        if metrics.width(word) > max_width:
+            result.extend(metrics.split(word, hyphenator, max_width, hyphen))
+        else:
+            result.append(word)
+    return result
+
+
+def layout_lines(text, font, max_width, hyphenator=None, hyphen="-"):
+    """
+    Greedy-Zeilenumbruch in linearer Zeit: jedes Wort wird einmal gemessen,
+    die Breite der aktuellen Zeile wird fortlaufend aufsummiert.
+    Gibt Line-Tupel zurück, deren Boxen draw_text_box direkt weiterverwendet.
+    """
+    metrics = metrics_for(font)
+    words = split_long_words(text.split(), metrics, max_width, hyphenator, hyphen)
+
+    lines = []
+    current = []
+    advance = 0.0  # Advance der aktuellen Zeile bis einschließlich des letzten Leerzeichens
+    for w in words:
+        w_advance, w_box = metrics.word(w)
+        if current and advance + w_box[2] > max_width:
+            lines.append(current)
+            current, advance = [], 0.0
+        current.append(w)
+        advance += w_advance + metrics.space
+    if current:
+        lines.append(current)
+    return [Line(" ".join(ws), metrics.line_bbox(ws)) for ws in lines]
+
+
+def layout_lines_char_split(text, font, max_width):
+    """
+    Umbruch wie in fit_text: zu breite Wörter werden zeichenweise in Stücke zerlegt,
+    der Rest wird greedy an Leerzeichen umbrochen.
+    """
+    metrics = metrics_for(font)
+    lines = []
+    current = []
+    advance = 0.0
+    for word in text.split():
+        if metrics.width(word) > max_width:
+            part = ""
+            for ch in word:
+                test = part + ch
+                if metrics.width(test) <= max_width:
+                    part = test
+                else:
+                    if current:
+                        lines.append(current)
+                        current, advance = [], 0.0
+                    lines.append([part])
+                    part = ch
+            if part:
+                # Rest wird ohne Breitenprüfung an die Zeile gehängt (wie bisher)
+                current.append(part)
+                advance += metrics.word(part)[0] + metrics.space
+            continue
+        w_advance, w_box = metrics.word(word)
+        if current and advance + w_box[2] > max_width:
+            lines.append(current)
+            current, advance = [], 0.0
+        current.append(word)
+        advance += w_advance + metrics.space
+    if current:
+        lines.append(current)
+    return [Line(" ".join(ws), metrics.line_bbox(ws)) for ws in lines]
+
+
+def text_height(lines, line_spacing):
+    """Gesamthöhe der Zeilen inkl. Zeilenabstand (wie in draw_text_box/fit_text)."""
+    if not lines:
+        return 0
+    return sum(ln.bbox[3] - ln.bbox[1] for ln in lines) + line_spacing * (len(lines) - 1)
+
+
+def largest_fitting(sizes, layout):
+    """
+    Binäre Suche über absteigend sortierte Schriftgrößen.
+    layout(size) liefert ein Ergebnis, falls der Text in dieser Größe passt, sonst None.
+    Gibt (size, Ergebnis) der größten passenden Größe zurück oder (None, None).
+    Setzt voraus, dass kleinere Schriften nie schlechter passen als größere.
+    """
+    best = (None, None)
+    lo, hi = 0, len(sizes) - 1
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        result = layout(sizes[mid])
+        if result is not None:
+            best = (sizes[mid], result)
+            hi = mid - 1
+        else:
+            lo = mid + 1
+    return best
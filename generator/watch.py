@@ -0,0 +1,57 @@
+import os
+
+
+def file_state(path):
+    """(mtime_ns, Größe) einer Datei oder None, wenn sie fehlt."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class PollingWatcher:
+    """
+    Erkennt Änderungen an einer Menge von Dateien durch regelmäßiges stat()
+    (plattformunabhängig, ohne inotify). Neu aufgenommene Dateien gelten
+    beim ersten Blick nicht als geändert.
+    """
+
+    def __init__(self):
+        self._states = {}
+
+    def poll(self, paths):
+        """Gibt die Pfade zurück, die sich seit dem letzten Aufruf geändert haben."""
+        changed = set()
+        states = {}
+        for path in paths:
+            state = file_state(path)
+            states[path] = state
+            if path in self._states and self._states[path] != state:
+                changed.add(path)
+        self._states = states
+        return changed
+
+
+class DependencyGraph:
+    """Ordnet jedem Modul die Dateien zu, von denen seine Ausgabe abhängt."""
+
+    def __init__(self):
+        self._deps = {}
+
+    def set(self, node, paths):
+        self._deps[node] = {os.path.abspath(p) for p in paths if p}
+
+    def remove(self, node):
+        self._deps.pop(node, None)
+
+    def nodes(self):
+        return set(self._deps)
+
+    def files(self):
+        return set().union(*self._deps.values()) if self._deps else set()
+
+    def affected(self, changed_paths):
+        """Alle Module, die von mindestens einer der geänderten Dateien abhängen."""
+        changed = {os.path.abspath(p) for p in changed_paths}
+        return {node for node, deps in self._deps.items() if deps & changed}
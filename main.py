@@ -1,6 +1,16 @@
 import os
+import sys
 import json
+import time
+import argparse
 from generator import generator
+from generator.catalog import iter_catalog, read_ahead
+from generator.fonts import clear_font_cache
+from generator.instrument import measure
+from generator.model import ConfigError, compile_module, palette_path, reload_palette
+from generator.preview import preview_config
+from generator.hyphenation import get_hyphenator
+from generator.watch import DependencyGraph, PollingWatcher
 
 # Basisverzeichnis des Socialmedia-Generators
 base_dir = os.path.dirname(os.path.abspath(__file__))
@@ -10,45 +20,533 @@ def load_json_file(path):
     with open(path, encoding="utf-8") as f:
         return json.load(f)
 
-def main():
-    # Alle Modul-Konfigurationsdateien
-    module_configs = [os.path.join(config_dir, f) for f in os.listdir(config_dir) if f.endswith(".json") and f != "config.json"]
+def find_module_configs():
+    """Alle Modul-Konfigurationsdateien (sortiert, damit die Reihenfolge stabil ist)."""
+    return sorted(
+        os.path.join(config_dir, f)
+        for f in os.listdir(config_dir)
+        if f.endswith(".json") and f != "config.json"
+    )
 
-    # Basis-Konfiguration (optional, falls benötigt)
-    config_path = "config/config.json"
+base_config_path = os.path.join(config_dir, "config.json")
+
+def load_base_config(config_path):
+    # Basis-Konfiguration (optional, falls benötigt); absoluter Pfad, unabhängig vom Arbeitsverzeichnis
     if os.path.exists(config_path):
-        base_config = load_json_file(config_path)
-    else:
-        base_config = {}
+        return load_json_file(config_path)
+    return {}
+
+def prepare_job(mod_path, base_config):
+    """Lädt eine Moduldatei und baut daraus einen Job (siehe prepare_module_job)."""
+    mod_config = load_json_file(mod_path)
+
+    # Wir gehen davon aus, dass immer genau ein Modul enthalten ist
+    return prepare_module_job(mod_config["modules"][0], mod_path, base_config)
+
+def prepare_module_job(module, source, base_config):
+    """
+    Baut die zusammengeführte Konfiguration eines Moduls.
+    Gibt ein Job-Dict zurück, das an render_job (auch in einem Worker-Prozess) übergeben wird.
+    """
+    module_id = module.get("id", "MODUL")
+
+    module_title = module.get("title", module_id)
+    output_dir = os.path.join("output", module_title.lower().replace(" ", "_"))
 
+    # Konfiguration zusammenführen
+    full_config = {
+        **base_config,
+        "modules": [module],
+        "output_path": output_dir
+    }
+    return {"source": source, "title": module_title, "config": full_config}
+
+def iter_catalog_jobs(path, base_config, queue_size, on_error):
+    """
+    Liest einen Katalog (JSON Lines oder JSON-Array) modulweise über eine begrenzte Queue
+    und liefert Jobs, sobald sie gelesen sind. Fehler werden über on_error(source, error, is_module)
+    gemeldet; ein defektes Modul überspringt nur dieses, ein Lesefehler beendet den Katalog.
+    """
+    print(f"\n📄 Lese Katalog: {path}")
+    try:
+        for i, module in enumerate(read_ahead(iter_catalog(path), queue_size), 1):
+            source = f"{path}#{i}"
+            try:
+                yield prepare_module_job(module, source, base_config)
+            except Exception as e:
+                on_error(source, e, True)
+    except Exception as e:
+        on_error(path, e, False)
+
+def iter_module_jobs(module_configs, base_config, on_error):
+    """Wie die Schleife in main(), aber lazy: jede Moduldatei wird erst gelesen, wenn sie dran ist."""
     for mod_path in module_configs:
         print(f"\n📄 Verarbeite Moduldatei: {mod_path}")
-        mod_config = load_json_file(mod_path)
+        try:
+            yield prepare_job(mod_path, base_config)
+        except Exception as e:
+            on_error(mod_path, e)
+
+def compile_job(job):
+    """Prüft und kompiliert die Config eines Jobs (ConfigError bei ungültigen Modulen)."""
+    job["module"] = compile_module(job["config"])
+    return job
+
+def start_job(job):
+    """Meldet den Start eines Moduls und legt seinen Ausgabeordner an."""
+    module = job["module"]
+    print(f"\n=== [MODUL: {job['title']}] Starte Generierung ===")
+
+    if module.fingerprint and isinstance(module.fingerprint.get("random_seed"), int):
+        print(f"[INFO] Verwendeter random_seed: {module.fingerprint['random_seed']}")
+
+    # Ausgabepfad vorbereiten
+    os.makedirs(module.output_path, exist_ok=True)
+
+def render_job(job):
+    """Rendert ein vorbereitetes Modul. Muss auf Modulebene liegen, damit es gepickelt werden kann."""
+    start_job(job)
+    options = job.get("instrument")
+    if not options:
+        return generator.create_socialmedia_carousel(job["module"])
+
+    profile_path = None
+    if options.get("profile_dir"):
+        slug = os.path.basename(os.path.normpath(job["config"]["output_path"]))
+        profile_path = os.path.join(options["profile_dir"], f"{slug}.prof")
+    result, metrics = measure(
+        lambda: generator.create_socialmedia_carousel(job["module"]),
+        trace_memory=options.get("trace_memory", False),
+        profile_path=profile_path,
+    )
+    return {**result, "metrics": metrics}
+
+def render_tile(job):
+    """Rendert ein Modul direkt in Kachelgröße für den Kontaktbogen (ohne Einzeldateien)."""
+    from generator.contact_sheet import tile_config
+
+    module = job["config"]["modules"][0]
+    image, _ = generator.render_carousel_image(tile_config(job["config"]))
+    return {"module_id": module.get("id", job["title"]), "image": image}
+
+def load_stage(job):
+    """Pipeline-Stufe 1: Render-Cache prüfen, Layout berechnen, Dozentenbild dekodieren."""
+    start_job(job)
+    module = job["module"]
+    cached, cache_key = generator.lookup_carousel(module)
+    if cached is not None:
+        return {"job": job, "result": cached}
+    scene = generator.build_scene(module)
+    generator.prefetch_images(scene, module)
+    return {"job": job, "scene": scene, "cache_key": cache_key}
+
+def render_stage(state):
+    """
+    Pipeline-Stufe 2: Fingerprint, Hintergrund, Boxen und Text zeichnen (samt Profilen).
+    Mit output.stream_slices zeichnet erst die Schreibstufe, Slice für Slice.
+    """
+    if "result" not in state and not generator.is_streaming(state["job"]["module"]):
+        _, state["full"], state["profiles"] = generator.paint_carousel(state["job"]["module"], state["scene"])
+    return state
+
+def write_stage(state):
+    """Pipeline-Stufe 3: Bilder kodieren und schreiben, Render-Cache-Stempel setzen."""
+    if "result" in state:
+        return state
+    if "full" not in state:
+        state["result"] = generator.stream_carousel(state["job"]["module"], state["scene"], state["cache_key"])
+    else:
+        state["result"] = generator.write_carousel(
+            state["job"]["module"], state["scene"], state.pop("full"), state.pop("profiles"), state["cache_key"]
+        )
+    return state
+
+def run_pipeline(jobs, report, depth):
+    """
+    Gestaffelte Ausführung in einem Prozess: Laden/Dekodieren, Zeichnen und Kodieren/Schreiben
+    laufen in je einem Thread über begrenzte Queues, sodass sich Platte und CPU überlappen.
+    Am Ende zeigt die Statistik je Stufe, wo der Durchsatz begrenzt ist.
+    """
+    from generator.pipeline import Pipeline
+
+    pipeline = Pipeline([("load", load_stage), ("render", render_stage), ("write", write_stage)], depth)
+    for job, state, error in pipeline.run(jobs):
+        report(job, None if error else state["result"], error)
+    pipeline.report()
+    return pipeline
+
+def run_serial(jobs, report, render=render_job):
+    for job in jobs:
+        try:
+            report(job, render(job), None)
+        except Exception as e:
+            report(job, None, e)
 
-        # Wir gehen davon aus, dass immer genau ein Modul enthalten ist
-        module = mod_config["modules"][0]
-        module_id = module.get("id", "MODUL")
+def run_parallel(jobs, report, workers, max_pending=None, render=render_job):
+    """
+    Verteilt die Module auf einen Prozess-Pool; ein fehlerhaftes Modul stoppt die anderen nicht.
+    Es werden höchstens max_pending Module gleichzeitig eingereicht (Standard: 2 je Worker),
+    damit auch sehr große Kataloge nicht komplett im Speicher landen.
+    """
+    # Erst hier importieren: multiprocessing kostet spürbar Startzeit, die der serielle Lauf nicht braucht
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
 
-        module_title = module.get("title", module_id)
-        output_dir = os.path.join("output", module_title.lower().replace(" ", "_"))
+    max_pending = max_pending or workers * 2
+    pending = {}
 
-        # Ausgabepfad vorbereiten
-        os.makedirs(output_dir, exist_ok=True)
+    def collect(futures):
+        for future in futures:
+            job = pending.pop(future)
+            try:
+                report(job, future.result(), None)
+            except Exception as e:
+                report(job, None, e)
 
-        # Konfiguration zusammenführen
-        full_config = {
-            **base_config,
-            "modules": [module],
-            "output_path": output_dir
-        }
+    from generator.output import limit_encoder_threads
 
-        print(f"\n=== [MODUL: {module_title}] Starte Generierung ===")
+    with ProcessPoolExecutor(max_workers=workers, initializer=limit_encoder_threads, initargs=(workers,)) as pool:
+        for job in jobs:
+            if len(pending) >= max_pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            pending[pool.submit(render, job)] = job
+        collect(as_completed(list(pending)))
 
-        fingerprint_cfg = module.get("fingerprint", {})
-        if fingerprint_cfg.get("enabled") and isinstance(fingerprint_cfg.get("random_seed"), int):
-            print(f"[INFO] Verwendeter random_seed: {fingerprint_cfg['random_seed']}")
+def module_dependencies(job):
+    """Dateien, von denen ein Modul abhängt: Moduldatei, Hauptconfig, Palette, Fonts, Bilder."""
+    return [job["source"], base_config_path, *job["module"].asset_paths]
+
+def run_watch(args, options):
+    """
+    Überwacht Modul-Configs, Hauptconfig, Palette, Fonts und Bilder und rendert nur
+    die betroffenen Module neu. Alles läuft in diesem Prozess, damit Font-, Layout-,
+    Fingerprint- und Foto-Caches zwischen den Durchläufen warm bleiben.
+    """
+    base_config = load_base_config(base_config_path)
+    graph = DependencyGraph()
+    watcher = PollingWatcher()
+    jobs = {}
+
+    def load(mod_path):
+        try:
+            job = compile_job(prepare_job(mod_path, base_config))
+        except Exception as e:
+            print(f"[FEHLER] {mod_path} konnte nicht geladen werden: {e}")
+            jobs.pop(mod_path, None)
+            # Nur die Moduldatei selbst beobachten, bis sie wieder lesbar ist
+            graph.set(mod_path, [mod_path, base_config_path])
+            return
+        if options:
+            job["instrument"] = options
+        jobs[mod_path] = job
+        graph.set(mod_path, module_dependencies(job))
+
+    def render(mod_paths):
+        for mod_path in sorted(mod_paths):
+            load(mod_path)
+            job = jobs.get(mod_path)
+            if job is None:
+                continue
+            start = time.perf_counter()
+            try:
+                result = render_job(job)
+            except Exception as e:
+                print(f"❌ {job['title']} fehlgeschlagen: {e}")
+                continue
+            status = "unverändert (Cache)" if result.get("cached") else "fertig"
+            print(f"✅ {job['title']} {status} in {time.perf_counter() - start:.2f}s")
+
+    render(find_module_configs())
+    # Silbentrennungs-Wörterbuch vorab laden, damit schon der erste Rebuild schnell ist
+    hyphenation_config = base_config.get("hyphenation", {})
+    if hyphenation_config.get("enabled", False):
+        get_hyphenator(hyphenation_config.get("lang", "de_DE"))
+    watcher.poll(graph.files())
+    print(f"\n👀 Watch-Modus: {len(graph.nodes())} Module, {len(graph.files())} Dateien (Strg+C beendet)")
+    try:
+        while True:
+            time.sleep(args.interval)
+            current = set(find_module_configs())
+            for mod_path in graph.nodes() - current:
+                print(f"🗑️  {mod_path} entfernt")
+                graph.remove(mod_path)
+                jobs.pop(mod_path, None)
+            changed = watcher.poll(graph.files())
+            dirty = current - graph.nodes()
+            if not changed and not dirty:
+                continue
+
+            for path in sorted(changed):
+                print(f"\n🔁 Geändert: {os.path.relpath(path)}")
+            if os.path.abspath(base_config_path) in changed:
+                base_config.clear()
+                base_config.update(load_base_config(base_config_path))
+            if os.path.abspath(palette_path) in changed:
+                reload_palette()
+            if any(path.endswith((".ttf", ".otf")) for path in changed):
+                clear_font_cache()
+            dirty |= graph.affected(changed)
+            # Neue Abhängigkeiten (z. B. ein anderes Foto) beobachtet der nächste poll() mit
+            render(dirty)
+    except KeyboardInterrupt:
+        print("\n👋 Watch-Modus beendet")
+    return 0
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Social-Media-Carousels für alle Module erzeugen.")
+    parser.add_argument(
+        "-w", "--workers", type=int, default=1,
+        help="Anzahl paralleler Worker-Prozesse (1 = seriell, 0 = alle CPU-Kerne)"
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="Render-Cache ignorieren und alle Module neu zeichnen"
+    )
+    parser.add_argument(
+        "--preview", action="store_true",
+        help="schnelle Vorschau in reduzierter Auflösung (Abschnitt \"preview\" der Config) nach <Ausgabe>/preview"
+    )
+    parser.add_argument(
+        "--contact-sheet", action="store_true",
+        help="alle Module verkleinert auf Kontaktbögen samt index.json setzen (Abschnitt \"contact_sheet\")"
+    )
+    parser.add_argument(
+        "--catalog", metavar="DATEI",
+        help="Module aus einem Katalog lesen (.jsonl/.ndjson: ein Modul pro Zeile, sonst JSON-Array "
+             "oder Objekt mit \"modules\") statt aus config/*.json"
+    )
+    parser.add_argument(
+        "--check", action="store_true",
+        help="nur alle Modul-Configs prüfen (Pfade, Farben, Typen) und Fehler melden, nichts rendern"
+    )
+    parser.add_argument(
+        "--pipeline", action="store_true",
+        help="Laden, Zeichnen und Schreiben in drei überlappenden Stufen (Threads) ausführen"
+    )
+    parser.add_argument(
+        "--pipeline-depth", type=int, default=2,
+        help="Pipeline: maximale Anzahl wartender Module zwischen zwei Stufen"
+    )
+    parser.add_argument(
+        "--queue-size", type=int, default=16,
+        help="Anzahl im Voraus gelesener Katalog-Module (begrenzt den Speicherbedarf)"
+    )
+    parser.add_argument(
+        "--watch", action="store_true",
+        help="config/ und referenzierte Assets beobachten und betroffene Module bei Änderungen neu rendern"
+    )
+    parser.add_argument(
+        "--interval", type=float, default=0.3,
+        help="Abfrageintervall des Watch-Modus in Sekunden"
+    )
+    parser.add_argument(
+        "--serve", action="store_true",
+        help="lokalen HTTP-Render-Server starten (POST /render, GET /metrics) statt config/ zu rendern"
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Adresse des Render-Servers")
+    parser.add_argument("--port", type=int, default=8765, help="Port des Render-Servers")
+    parser.add_argument(
+        "--queue-limit", type=int, default=16,
+        help="Render-Server: wartende Anfragen zusätzlich zu den laufenden, darüber gibt es 503"
+    )
+    parser.add_argument(
+        "--metrics", metavar="DATEI",
+        help="Laufzeit, CPU-Zeit und Speicher je Modul und Stufe messen und als JSON Lines schreiben"
+    )
+    parser.add_argument(
+        "--trace-memory", action="store_true",
+        help="zusätzlich Python-Allokationen per tracemalloc messen (langsamer)"
+    )
+    parser.add_argument(
+        "--profile", type=int, default=0, metavar="N",
+        help="cProfile-Dumps der N langsamsten Module behalten"
+    )
+    parser.add_argument(
+        "--profile-dir", default=os.path.join("output", "profiles"),
+        help="Verzeichnis für die cProfile-Dumps (Standard: output/profiles)"
+    )
+    args = parser.parse_args(argv)
+    if args.check and (args.watch or args.serve):
+        parser.error("--check ist nicht mit --watch oder --serve kombinierbar")
+    if args.pipeline:
+        if args.workers != 1:
+            parser.error("--pipeline läuft in einem Prozess und ist nicht mit --workers kombinierbar")
+        if args.contact_sheet or args.watch or args.serve:
+            parser.error("--pipeline ist nicht mit --contact-sheet, --watch oder --serve kombinierbar")
+        if args.metrics or args.trace_memory or args.profile > 0:
+            parser.error("--pipeline ist nicht mit --metrics, --trace-memory oder --profile kombinierbar")
+    return args
+
+def instrument_options(args):
+    """Mess-Optionen für render_job oder None, wenn nichts gemessen werden soll."""
+    if not (args.metrics or args.trace_memory or args.profile > 0):
+        return None
+    return {
+        "trace_memory": args.trace_memory,
+        "profile_dir": args.profile_dir if args.profile > 0 else None,
+    }
+
+def write_metrics(path, records):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    print(f"[INFO] Metriken gespeichert: {path}")
+
+def print_metrics_summary(records):
+    """Tabelle aller gemessenen Module, langsamste zuerst, mit der jeweils teuersten Stufe."""
+    if not records:
+        return
+    def fmt(value, unit, sign=""):
+        return "-" if value is None else f"{value:{sign}.1f}{unit}"
+
+    width = max(len("Modul"), *(len(r["module"]) for r in records))
+    print(f"\n{'Modul':<{width}}  {'Wall':>8}  {'CPU':>8}  {'RSS Δ':>9}  {'Alloc':>9}  Langsamste Stufe")
+    for r in sorted(records, key=lambda r: r["wall_s"], reverse=True):
+        stages = r.get("stages", {})
+        slowest = max(stages.items(), key=lambda item: item[1]["wall_s"], default=None)
+        slowest_text = f"{slowest[0]} ({slowest[1]['wall_s']:.2f}s)" if slowest else "-"
+        print(
+            f"{r['module']:<{width}}  {r['wall_s']:>7.2f}s  {r['cpu_s']:>7.2f}s  "
+            f"{fmt(r.get('rss_delta_mb'), 'MB', '+'):>9}  {fmt(r.get('alloc_peak_mb'), 'MB'):>9}  {slowest_text}"
+        )
+
+def keep_slowest_profiles(records, count):
+    """Löscht die Profile aller Module außer den count langsamsten."""
+    ranked = sorted((r for r in records if r.get("profile")), key=lambda r: r["wall_s"], reverse=True)
+    for r in ranked[count:]:
+        if os.path.exists(r["profile"]):
+            os.remove(r["profile"])
+        r.pop("profile")
+    for r in ranked[:count]:
+        print(f"[INFO] Profil {r['module']}: {r['profile']} (python -m pstats {r['profile']})")
+
+def main(argv=None):
+    args = parse_args(argv)
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+
+    options = instrument_options(args)
+    if args.watch:
+        return run_watch(args, options)
+    if args.serve:
+        from generator.server import serve
+        return serve(load_base_config(base_config_path), args.host, args.port, workers, args.queue_limit)
+
+    base_config = load_base_config(base_config_path)
+    if args.no_cache:
+        base_config["cache"] = {**base_config.get("cache", {}), "render": False}
+    failed = []
+    counts = {"modules": 0, "done": 0, "succeeded": 0, "cache_hits": 0}
+    metrics = []
+
+    def load_error(source, error, is_module=True):
+        print(f"[FEHLER] {source} konnte nicht geladen werden: {error}")
+        failed.append(source)
+        if args.catalog and is_module:
+            counts["modules"] += 1
+
+    if args.catalog:
+        # Streaming: Module werden gerendert, während der Katalog noch gelesen wird
+        jobs = iter_catalog_jobs(args.catalog, base_config, args.queue_size, load_error)
+        total = None
+    elif args.pipeline:
+        # Moduldateien liest erst die Lade-Stufe der Pipeline
+        module_configs = find_module_configs()
+        counts["modules"] = len(module_configs)
+        jobs = iter_module_jobs(module_configs, base_config, load_error)
+        total = len(module_configs)
+    else:
+        module_configs = find_module_configs()
+        counts["modules"] = len(module_configs)
+        jobs = []
+        for mod_path in module_configs:
+            print(f"\n📄 Verarbeite Moduldatei: {mod_path}")
+            try:
+                jobs.append(prepare_job(mod_path, base_config))
+            except Exception as e:
+                load_error(mod_path, e)
+        total = len(jobs)
+
+    def with_options(jobs):
+        for job in jobs:
+            if args.catalog:
+                counts["modules"] += 1
+            if args.preview:
+                job["config"] = preview_config(job["config"])
+            # Config prüfen und auflösen, bevor das Modul gezeichnet wird
+            try:
+                compile_job(job)
+            except ConfigError as e:
+                print(f"[FEHLER] {job['source']}: {e}")
+                failed.append(job["source"])
+                continue
+            if options:
+                job["instrument"] = options
+            yield job
+
+    jobs = with_options(jobs)
+    if total is not None and not args.pipeline:
+        # Alle Moduldateien vorab prüfen: ungültige Module werden abgelehnt, bevor das erste gezeichnet wird
+        jobs = list(jobs)
+        total = len(jobs)
+    if args.check:
+        valid = sum(1 for _ in jobs)
+        print(f"\n🔎 {valid} von {counts['modules']} Modulen gültig")
+        return 1 if failed else 0
+
+    sheets = None
+    if args.contact_sheet:
+        from generator.contact_sheet import ContactSheetWriter, contact_sheet_settings
+        sheets = ContactSheetWriter(contact_sheet_settings(base_config))
+    render = render_tile if sheets else render_job
+
+    def report(job, result, error):
+        counts["done"] += 1
+        prefix = f"[{counts['done']}/{total}]" if total is not None else f"[{counts['done']}]"
+        if error is None:
+            counts["succeeded"] += 1
+            if sheets:
+                sheets.add(result["module_id"], job["title"], result["image"], job["source"])
+            if result.get("cached"):
+                counts["cache_hits"] += 1
+            if "metrics" in result:
+                metrics.append({
+                    "module": job["title"],
+                    "source": job["source"],
+                    "cached": bool(result.get("cached")),
+                    **result["metrics"],
+                })
+            status = "unverändert (Cache)" if result.get("cached") else "fertig"
+            print(f"{prefix} ✅ {job['title']} {status}")
+        else:
+            failed.append(job["source"])
+            print(f"{prefix} ❌ {job['title']} fehlgeschlagen: {error}")
+            if workers == 1:
+                import traceback
+                traceback.print_exception(type(error), error, error.__traceback__)
+
+    if args.pipeline:
+        run_pipeline(jobs, report, args.pipeline_depth)
+    elif workers > 1 and (total is None or total > 1):
+        if total is not None:
+            workers = min(workers, total)
+        print(f"[INFO] Rendere {total if total is not None else 'alle'} Module mit {workers} Worker-Prozessen")
+        run_parallel(jobs, report, workers, render=render)
+    else:
+        run_serial(jobs, report, render)
+    if sheets:
+        sheets.close()
 
-        generator.create_socialmedia_carousel(full_config)
+    print(f"\n🏁 {counts['succeeded']} von {counts['modules']} Modulen erfolgreich")
+    if not args.no_cache and not sheets:
+        print(f"[INFO] Render-Cache: {counts['cache_hits']} Treffer, {counts['done'] - counts['cache_hits']} neu gerendert")
+    if options:
+        if args.profile > 0:
+            keep_slowest_profiles(metrics, args.profile)
+        print_metrics_summary(metrics)
+        if args.metrics:
+            write_metrics(args.metrics, metrics)
+    return 1 if failed else 0
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())